@@ -0,0 +1,88 @@
+"""
+Shared helpers for the benchmarks in this directory.
+
+On the host, MicroPython's builtin modules are replaced by the stand-ins in tests/fakes and the badge library is
+imported from firmware/modules. The backend call counts are then the same as on the badge, but the timings are of
+the pure Python stand-ins and say little about the badge. For real timings, copy this directory onto the badge and
+run a benchmark there, e.g. ``import bench_fill_rect``.
+"""
+import sys
+import time
+
+try:
+    import micropython
+except ImportError:
+    import os
+    _ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    sys.path.insert(0, os.path.join(_ROOT, 'tests', 'fakes'))
+    sys.path.insert(0, os.path.join(_ROOT, 'firmware', 'modules'))
+
+if hasattr(time, 'ticks_us'):
+    def _now_us():
+        return time.ticks_us()
+
+    def _elapsed_us(start):
+        return time.ticks_diff(time.ticks_us(), start)
+else:
+    def _now_us():
+        return time.perf_counter()
+
+    def _elapsed_us(start):
+        return int((time.perf_counter() - start) * 1000000)
+
+
+class Counter:
+    """
+    Wraps a function, counting the calls made to it
+
+    :param func: The function to wrap
+    """
+
+    def __init__(self, func):
+        self._func = func
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self._func(*args, **kwargs)
+
+
+def display():
+    """
+    Creates a display surface with a GFX wired to it the way FCB does it, with every backend call counted
+
+    :return: (epd, gfx, counters) where counters maps backend names to their :class:`Counter`
+    """
+    from fcb._epd import EPD
+    from fcb._gfx import GFX
+    epd = EPD(spi=None, cs_pin=None, reset_pin=None, busy_pin=None, adt=None)
+    counters = {}
+    for name in ('set_pixel', 'hline', 'vline', 'fill_rect', 'fill', 'points', 'hspans', 'vspans', 'blit', 'rect'):
+        counters[name] = Counter(getattr(epd, name))
+    gfx = GFX(epd.width, epd.height, counters['set_pixel'], counters['hline'], counters['vline'],
+              counters['fill_rect'], counters['fill'], counters['points'], counters['hspans'], counters['vspans'],
+              counters['blit'], counters['rect'])
+    return epd, gfx, counters
+
+
+def run(name, func, counters=None, repeat=5):
+    """
+    Runs a benchmark and prints the mean time of a run and the backend calls it made
+
+    :param name: What is being measured
+    :param func: The function to time, called without arguments
+    :param counters: A dict of :class:`Counter` instances to report the calls of
+    :param repeat: How many times to run the function
+    """
+    if counters:
+        for counter in counters.values():
+            counter.calls = 0
+    start = _now_us()
+    for _ in range(repeat):
+        func()
+    elapsed = _elapsed_us(start) // repeat
+    calls = ''
+    if counters:
+        calls = ', '.join('%s %d' % (key, counter.calls // repeat) for key, counter in sorted(counters.items())
+                          if counter.calls)
+    print('%-40s %9d us  %s' % (name, elapsed, calls))
@@ -0,0 +1,23 @@
+"""
+GFX.fill_rect and clearing the display, through the native fill_rect and fill backends against the per-column vline
+loop they replaced.
+
+Usage: python bench/bench_fill_rect.py
+"""
+import _bench
+from fcb._epd import WHITE, BLACK
+from fcb._gfx import GFX
+
+
+def main():
+    epd, gfx, counters = _bench.display()
+    # Without the fill_rect and fill backends, the way GFX drew every filled rectangle before
+    old = GFX(epd.width, epd.height, counters['set_pixel'], counters['hline'], counters['vline'])
+
+    _bench.run('fill_rect 100x50, vline loop', lambda: old.fill_rect(10, 10, 100, 50, BLACK), counters)
+    _bench.run('fill_rect 100x50, native fill_rect', lambda: gfx.fill_rect(10, 10, 100, 50, BLACK), counters)
+    _bench.run('clear_disp, vline loop', lambda: old.fill_rect(0, 0, epd.width, epd.height, WHITE), counters)
+    _bench.run('clear_disp, native fill', lambda: gfx.fill_rect(0, 0, epd.width, epd.height, WHITE), counters)
+
+
+main()
@@ -0,0 +1,41 @@
+"""
+GFX.fill_polygon's scanline fill against drawing the same shapes as a fan of fill_triangle calls from their centre.
+
+Usage: python bench/bench_polygon.py
+"""
+import math
+
+import _bench
+from fcb._epd import BLACK
+
+
+def _star(cx, cy, outer, inner, points):
+    vertices = []
+    for i in range(points * 2):
+        radius = outer if i % 2 == 0 else inner
+        angle = math.pi * i / points
+        vertices.append((cx + int(radius * math.cos(angle)), cy + int(radius * math.sin(angle))))
+    return vertices
+
+
+def _fan(gfx, centre, vertices):
+    # Both shapes are star shaped around their centre, so a fan of triangles from it covers them
+    cx, cy = centre
+    for i in range(len(vertices)):
+        x0, y0 = vertices[i]
+        x1, y1 = vertices[(i + 1) % len(vertices)]
+        gfx.fill_triangle(cx, cy, x0, y0, x1, y1, BLACK)
+
+
+def main():
+    epd, gfx, counters = _bench.display()
+    shapes = (
+        ('12-gon r50', (148, 64), _star(148, 64, 50, 50, 6)),
+        ('5-point star r60', (148, 64), _star(148, 64, 60, 25, 5)),
+    )
+    for name, centre, vertices in shapes:
+        _bench.run(name + ', fill_polygon', lambda: gfx.fill_polygon(vertices, BLACK), counters)
+        _bench.run(name + ', triangle fan', lambda: _fan(gfx, centre, vertices), counters)
+
+
+main()
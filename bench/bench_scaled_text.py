@@ -0,0 +1,36 @@
+"""
+Scaled Font text on the 296x128 display at scales 2 to 4: a scale x scale fill_rect for every set bit, the way
+scaled text used to be drawn, against a fill_rect for each vertical run of set bits.
+
+Usage: python bench/bench_scaled_text.py
+"""
+import _bench
+from fcb._epd import BLACK
+from fcb._font import Font
+
+_TEXT = 'Hello, Ada'
+
+
+def _pixel_blocks(font, text, x, y, scale, fill_rect, colour):
+    # The old way of drawing scaled text, one block per set bit
+    face = font.face
+    for ch in text:
+        code = ord(ch)
+        for char_x in range(face.glyph_width(code)):
+            line = face.column(code, char_x)
+            for char_y in range(face.height):
+                if (line >> char_y) & 0x1:
+                    fill_rect(x + char_x * scale, y + char_y * scale, scale, scale, colour)
+        x += (face.glyph_width(code) + 1) * scale
+
+
+def main():
+    epd, gfx, counters = _bench.display()
+    font = Font(epd.width, epd.height, counters['set_pixel'], counters['points'], None, counters['fill_rect'])
+    for scale in (2, 3, 4):
+        _bench.run('scale %d, pixel blocks' % scale,
+                   lambda: _pixel_blocks(font, _TEXT, 0, 0, scale, counters['fill_rect'], BLACK), counters)
+        _bench.run('scale %d, runs' % scale, lambda: font.text(_TEXT, 0, 0, BLACK, scale=scale), counters)
+
+
+main()
@@ -0,0 +1,27 @@
+"""
+Font text drawing: the glyph loop collecting every set pixel into points, against blitting cached glyphs, and against
+blitting a whole cached string.
+
+Usage: python bench/bench_text.py
+"""
+import _bench
+from fcb._epd import BLACK
+from fcb._font import Font
+
+_TEXT = 'The quick brown fox jumps over the lazy dog'
+
+
+def main():
+    epd, gfx, counters = _bench.display()
+    # Without a blit function every character goes through the glyph loop, the way Font drew all text before
+    loop = Font(epd.width, epd.height, counters['set_pixel'], counters['points'])
+    font = Font(epd.width, epd.height, counters['set_pixel'], counters['points'], counters['blit'],
+                counters['fill_rect'])
+
+    _bench.run('text, glyph loop', lambda: loop.text(_TEXT, 0, 0, BLACK), counters)
+    _bench.run('text, glyph blits', lambda: font.text(_TEXT, 0, 10, BLACK), counters)
+    _bench.run('text, cached string blit', lambda: font.text(_TEXT, 0, 20, BLACK, cache=True), counters)
+    print('cache', font.cache_stats)
+
+
+main()
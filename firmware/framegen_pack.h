@@ -0,0 +1,68 @@
+#ifndef MICROPY_INCLUDED_ESP8266_FRAMEGEN_PACK_H
+#define MICROPY_INCLUDED_ESP8266_FRAMEGEN_PACK_H
+
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+
+// The plane packing behind framegen.pack_planes, kept free of MicroPython so
+// it can also be built on the host and tested against a reference.
+
+#define FRAMEGEN_BLACK (1)
+#define FRAMEGEN_RED (2)
+
+// Packs gate rows row0 to row1 and column bytes col0 to col1 of the B/W and
+// red planes from a GS2_HMSB framebuffer width pixels wide and row_bytes * 8
+// pixels high. Framebuffer column x becomes gate row x, made of row_bytes
+// bytes with the smallest y in the MSB. The window must already be clipped.
+//
+// Each byte is compared with what the planes held before it is written. The
+// bounding box of the bytes that changed is stored in changed as (first row,
+// last row, first column byte, last column byte) and true is returned, or
+// false if nothing changed.
+static inline bool framegen_pack(const uint8_t *src, int width, int row_bytes, uint8_t *black, uint8_t *red,
+        int row0, int row1, int col0, int col1, int *changed) {
+    int changed_row0 = width;
+    int changed_row1 = -1;
+    int changed_col0 = row_bytes;
+    int changed_col1 = -1;
+
+    for (int x = row0; x <= row1; x++) {
+        uint8_t shift = (x & 0x3) << 1;
+        for (int col = col0; col <= col1; col++) {
+            uint8_t out_b = 0;
+            uint8_t out_r = 0;
+            for (int i = 0; i < 8; i++) {
+                int y = (col * 8) + i;
+                uint8_t v = (src[(x + y * width) >> 2] >> shift) & 0x3;
+                out_b <<= 1;
+                out_r <<= 1;
+                if (v == FRAMEGEN_BLACK) {
+                    out_b |= 1;
+                } else if (v == FRAMEGEN_RED) {
+                    out_r |= 1;
+                }
+            }
+            size_t idx = x * row_bytes + col;
+            if (black[idx] != out_b || red[idx] != out_r) {
+                black[idx] = out_b;
+                red[idx] = out_r;
+                changed_row0 = changed_row0 < x ? changed_row0 : x;
+                changed_row1 = x;
+                changed_col0 = changed_col0 < col ? changed_col0 : col;
+                changed_col1 = changed_col1 > col ? changed_col1 : col;
+            }
+        }
+    }
+
+    if (changed_row1 < 0) {
+        return false;
+    }
+    changed[0] = changed_row0;
+    changed[1] = changed_row1;
+    changed[2] = changed_col0;
+    changed[3] = changed_col1;
+    return true;
+}
+
+#endif // MICROPY_INCLUDED_ESP8266_FRAMEGEN_PACK_H
@@ -45,11 +45,83 @@ typedef struct _machine_ep_spi_obj_t {
     mp_obj_base_t base;
 } machine_ep_spi_obj_t;
 
+// The panel is driven in 3-wire mode, so every byte goes out as a 9 bit frame
+// with the D/C bit in front. 56 frames (504 bits) fit in the 512 bit HSPI FIFO.
+#define EP_SPI_FRAME_BITS (9)
+#define EP_SPI_FRAMES_PER_XFER (56)
+// Let pending tasks run after this many bytes have been clocked out
+#define EP_SPI_POLL_INTERVAL (1024)
+
+typedef struct _ep_spi_fifo_t {
+    uint32_t words[16];
+    uint32_t frames;
+    size_t since_poll;
+} ep_spi_fifo_t;
+
+STATIC void ep_spi_fifo_flush(ep_spi_fifo_t *fifo) {
+    if (fifo->frames == 0) {
+        return;
+    }
+    uint32_t bits = fifo->frames * EP_SPI_FRAME_BITS;
+
+    while (spi_busy(HSPI)) {};
+    CLEAR_PERI_REG_MASK(SPI_USER(HSPI), SPI_USR_MOSI | SPI_USR_MISO |
+                        SPI_USR_COMMAND | SPI_USR_ADDR | SPI_USR_DUMMY);
+    WRITE_PERI_REG(SPI_USER1(HSPI), ((bits - 1) & SPI_USR_MOSI_BITLEN) << SPI_USR_MOSI_BITLEN_S);
+    SET_PERI_REG_MASK(SPI_USER(HSPI), SPI_USR_MOSI);
+    for (uint32_t i = 0; i < (bits + 31) / 32; i++) {
+        WRITE_PERI_REG(SPI_W0(HSPI) + (i * 4), fifo->words[i]);
+    }
+    SET_PERI_REG_MASK(SPI_CMD(HSPI), SPI_USR);
+
+    fifo->since_poll += fifo->frames;
+    if (fifo->since_poll >= EP_SPI_POLL_INTERVAL) {
+        fifo->since_poll = 0;
+        ets_event_poll();
+    }
+    memset(fifo->words, 0, sizeof(fifo->words));
+    fifo->frames = 0;
+}
+
+STATIC void ep_spi_fifo_push(ep_spi_fifo_t *fifo, uint8_t byte, bool dc) {
+    // Pack the frame MSB first, SPI_WR_BYTE_ORDER is set in init
+    uint32_t frame = (dc ? (1 << 8) : 0) | byte;
+    uint32_t bits = fifo->frames * EP_SPI_FRAME_BITS;
+    uint32_t word = bits >> 5;
+    int shift = 32 - EP_SPI_FRAME_BITS - (bits & 31);
+    if (shift >= 0) {
+        fifo->words[word] |= frame << shift;
+    } else {
+        fifo->words[word] |= frame >> -shift;
+        fifo->words[word + 1] |= frame << (32 + shift);
+    }
+    if (++fifo->frames == EP_SPI_FRAMES_PER_XFER) {
+        ep_spi_fifo_flush(fifo);
+    }
+}
+
+STATIC void ep_spi_write_buf(const uint8_t *src, size_t len, bool dc) {
+    ep_spi_fifo_t fifo = {{0}, 0, 0};
+    for (size_t i = 0; i < len; i++) {
+        ep_spi_fifo_push(&fifo, src[i], dc);
+    }
+    ep_spi_fifo_flush(&fifo);
+    while (spi_busy(HSPI)) {};
+}
+
 STATIC mp_obj_t mp_machine_ep_spi_write(mp_obj_t self, mp_obj_t data, mp_obj_t dc_in) {
+    bool dc = mp_obj_is_true(dc_in) ? 1 : 0;
+
+    // Fast path for bytes, bytearray, memoryview and anything else with the buffer protocol
+    mp_buffer_info_t bufinfo;
+    if (mp_get_buffer(data, &bufinfo, MP_BUFFER_READ)) {
+        ep_spi_write_buf(bufinfo.buf, bufinfo.len, dc);
+        return mp_const_none;
+    }
+
     mp_obj_t data_iter = mp_getiter(data, NULL);
 
     mp_obj_t iter_data;
-    bool dc = mp_obj_is_true(dc_in) ? 1 : 0;
     while ((iter_data = mp_iternext(data_iter)) != MP_OBJ_STOP_ITERATION) {
         spi_transaction(HSPI, 0, 0, 0, 0, 1, dc, 0, 0);
         spi_tx8fast(HSPI, mp_obj_int_get_checked(iter_data));
@@ -59,6 +131,37 @@ STATIC mp_obj_t mp_machine_ep_spi_write(mp_obj_t self, mp_obj_t data, mp_obj_t d
 }
 STATIC MP_DEFINE_CONST_FUN_OBJ_3(mp_machine_ep_spi_write_obj, mp_machine_ep_spi_write);
 
+// Replays a precompiled command script. The script is a run of entries, each
+// made of a command byte, a data length byte and that many data bytes. The
+// whole script is packed into as few FIFO transactions as possible.
+STATIC mp_obj_t mp_machine_ep_spi_write_script(mp_obj_t self, mp_obj_t script) {
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(script, &bufinfo, MP_BUFFER_READ);
+    const uint8_t *src = bufinfo.buf;
+    size_t len = bufinfo.len;
+
+    ep_spi_fifo_t fifo = {{0}, 0, 0};
+    size_t i = 0;
+    while (i + 2 <= len) {
+        size_t n = src[i + 1];
+        if (i + 2 + n > len) {
+            mp_raise_ValueError("truncated script");
+        }
+        ep_spi_fifo_push(&fifo, src[i], false);
+        for (size_t j = 0; j < n; j++) {
+            ep_spi_fifo_push(&fifo, src[i + 2 + j], true);
+        }
+        i += 2 + n;
+    }
+    if (i != len) {
+        mp_raise_ValueError("truncated script");
+    }
+    ep_spi_fifo_flush(&fifo);
+    while (spi_busy(HSPI)) {};
+    return mp_const_none;
+}
+STATIC MP_DEFINE_CONST_FUN_OBJ_2(mp_machine_ep_spi_write_script_obj, mp_machine_ep_spi_write_script);
+
 /******************************************************************************/
 // MicroPython bindings for HSPI
 
@@ -92,6 +195,7 @@ STATIC mp_obj_t machine_ep_spi_make_new(const mp_obj_type_t *type, size_t n_args
 STATIC const mp_rom_map_elem_t machine_ep_spi_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_init), MP_ROM_PTR(&machine_ep_spi_init_obj) },
     { MP_ROM_QSTR(MP_QSTR_write), MP_ROM_PTR(&mp_machine_ep_spi_write_obj) },
+    { MP_ROM_QSTR(MP_QSTR_write_script), MP_ROM_PTR(&mp_machine_ep_spi_write_script_obj) },
 };
 
 MP_DEFINE_CONST_DICT(mp_machine_ep_spi_locals_dict, machine_ep_spi_locals_dict_table);
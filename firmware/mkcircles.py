@@ -0,0 +1,52 @@
+"""
+Generates modules/fcb/_circles.py, the table of circle row half widths GFX keeps in flash
+
+Usage: python mkcircles.py [max_radius] > modules/fcb/_circles.py
+"""
+import sys
+
+
+def quadrant(radius):
+    # Same midpoint trace as fcb._gfx.GFX._quadrant
+    ext = [0] * (radius + 1)
+    ext[0] = radius
+    f = 1 - radius
+    ddF_x = 1
+    ddF_y = -2 * radius
+    x = 0
+    y = radius
+    while x < y:
+        if f >= 0:
+            y -= 1
+            ddF_y += 2
+            f += ddF_y
+        x += 1
+        ddF_x += 2
+        f += ddF_x
+        ext[y] = max(ext[y], x)
+        ext[x] = max(ext[x], y)
+    return ext
+
+
+def main():
+    max_radius = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    assert 0 <= max_radius < 256
+    table = bytearray()
+    for radius in range(max_radius + 1):
+        table.extend(quadrant(radius))
+
+    print("# Generated by mkcircles.py, do not edit")
+    print("from micropython import const")
+    print()
+    print("MAX_RADIUS = const(%d)" % max_radius)
+    print()
+    print("# Half width of each row of a circle, indexed by the distance of the row from the centre. The rows of")
+    print("# radius r start at r * (r + 1) // 2.")
+    print("TABLE = (")
+    for i in range(0, len(table), 24):
+        print("    b'%s'" % ''.join('\\x%02x' % b for b in table[i:i + 24]))
+    print(")")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Dithers photos and gradients into sprite files for fcb._sprite.Sprite.load
+
+Uses the same Floyd-Steinberg and ordered dithering as fcb._dither, so images come out
+the same as dithering them on the badge, without the time it takes there. Requires Pillow.
+
+Usage: python mkdither.py [--ordered] [--red] [--width N] output_dir input.png [input.png ...]
+"""
+import os
+import sys
+import struct
+import argparse
+
+from PIL import Image
+
+from mksprite import HEADER, MAGIC, WHITE, BLACK, RED, pack_gs2
+
+BAYER = (0, 8, 2, 10, 12, 4, 14, 6, 3, 11, 1, 9, 15, 7, 13, 5)
+
+
+def channels(img, use_red):
+    # Brightness of each pixel, and how much redder it is than it is green or blue
+    img = img.convert('RGB')
+    width, height = img.size
+    pixels = img.load()
+    grey = []
+    red = []
+    for y in range(height):
+        for x in range(width):
+            r, g, b = pixels[x, y]
+            grey.append((r * 299 + g * 587 + b * 114) // 1000)
+            red.append(max(0, r - max(g, b)) if use_red else 0)
+    return grey, red
+
+
+def ordered(grey, red, width, height):
+    values = []
+    for y in range(height):
+        for x in range(width):
+            i = y * width + x
+            threshold = (BAYER[((y & 3) << 2) + (x & 3)] << 4) + 8
+            if red[i] >= threshold:
+                values.append(RED)
+            elif grey[i] >= threshold:
+                values.append(WHITE)
+            else:
+                values.append(BLACK)
+    return values
+
+
+def diffuse(grey, red, width, height):
+    # Error in sixteenths, with a spare entry at each end of the rows like on the badge
+    err, nxt = [0] * (width + 2), [0] * (width + 2)
+    red_err, red_nxt = [0] * (width + 2), [0] * (width + 2)
+    values = []
+    for y in range(height):
+        for x in range(width):
+            i = y * width + x
+            v = grey[i] + (err[x + 1] >> 4)
+            r = red[i] + (red_err[x + 1] >> 4)
+            c = BLACK
+            if r >= 128:
+                c = RED
+                r -= 255
+            red_err[x + 2] += r * 7
+            red_nxt[x] += r * 3
+            red_nxt[x + 1] += r * 5
+            red_nxt[x + 2] += r
+            if c != RED:
+                if v >= 128:
+                    c = WHITE
+                    v -= 255
+                err[x + 2] += v * 7
+                nxt[x] += v * 3
+                nxt[x + 1] += v * 5
+                nxt[x + 2] += v
+            values.append(c)
+        err, nxt = nxt, [0] * (width + 2)
+        red_err, red_nxt = red_nxt, [0] * (width + 2)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dither images into badge sprite files")
+    parser.add_argument('--ordered', action='store_true', help="use ordered instead of error diffusion dithering")
+    parser.add_argument('--red', action='store_true', help="dither reddish areas with the red ink")
+    parser.add_argument('--width', type=int, help="scale the images to this width first")
+    parser.add_argument('output_dir')
+    parser.add_argument('inputs', nargs='+')
+    args = parser.parse_args()
+
+    for path in args.inputs:
+        img = Image.open(path)
+        if args.width:
+            img = img.resize((args.width, max(1, img.size[1] * args.width // img.size[0])), Image.LANCZOS)
+        width, height = img.size
+        grey, red = channels(img, args.red)
+        if args.ordered:
+            values = ordered(grey, red, width, height)
+        else:
+            values = diffuse(grey, red, width, height)
+        data = pack_gs2(values, width, height)
+
+        name = os.path.splitext(os.path.basename(path))[0] + '.fcs'
+        with open(os.path.join(args.output_dir, name), 'wb') as fout:
+            fout.write(struct.pack(HEADER, MAGIC, width, height, 0))
+            fout.write(data)
+        print('%-24s %3d x %3d  %6d bytes' % (name, width, height, struct.calcsize(HEADER) + len(data)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Renders a TrueType or OpenType font into a proportional bitmap font file for fcb._font.FontFile
+
+Each character gets its own width, so text set in it is narrower and easier to read than the
+built in fixed width font. Requires Pillow.
+
+Usage: python mkfont.py [--first N] [--last N] font.ttf size output.fnt
+"""
+import sys
+import struct
+import argparse
+
+from PIL import Image, ImageDraw, ImageFont
+
+MAGIC = b'FF'
+HEADER = '<2sBBBH'
+
+
+def render(font, ch, height, ascent):
+    # The character's pixels as columns of booleans, trimmed to where it has ink or its advance ends
+    advance = int(round(font.getlength(ch)))
+    img = Image.new('1', (max(advance, 1) * 2 + height, height), 0)
+    ImageDraw.Draw(img).text((0, ascent), ch, font=font, fill=1, anchor='ls')
+    pixels = img.load()
+    ink = [x for x in range(img.size[0]) if any(pixels[x, y] for y in range(height))]
+    # The badge puts a pixel gap after every character, so that comes off the advance
+    width = max(ink[-1] + 1 if ink else 0, advance - 1)
+    return [[bool(pixels[x, y]) for y in range(height)] for x in range(width)]
+
+
+def pack(columns, cell_width, height):
+    # A column after another, padded out to the widest character, with the top row in the lowest bit
+    column_bytes = (height + 7) >> 3
+    data = bytearray(cell_width * column_bytes)
+    for x, column in enumerate(columns):
+        for y, ink in enumerate(column):
+            if ink:
+                data[x * column_bytes + (y >> 3)] |= 1 << (y & 7)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a font into a badge bitmap font file")
+    parser.add_argument('--first', type=int, default=32, help="code of the first character to include")
+    parser.add_argument('--last', type=int, default=126, help="code of the last character to include")
+    parser.add_argument('font')
+    parser.add_argument('size', type=int, help="height of the characters in pixels")
+    parser.add_argument('output')
+    args = parser.parse_args()
+
+    font = ImageFont.truetype(args.font, args.size)
+    ascent, descent = font.getmetrics()
+    height = ascent + descent
+    if height > 255:
+        parser.error("font too tall")
+    glyphs = [render(font, chr(code), height, ascent) for code in range(args.first, args.last + 1)]
+    cell_width = max(len(columns) for columns in glyphs)
+    if cell_width > 255:
+        parser.error("font too wide")
+
+    with open(args.output, 'wb') as fout:
+        fout.write(struct.pack(HEADER, MAGIC, cell_width, height, args.first, len(glyphs)))
+        fout.write(bytes(len(columns) for columns in glyphs))
+        for columns in glyphs:
+            fout.write(pack(columns, cell_width, height))
+    print('%s: %d characters, %d pixels high, up to %d wide, %d bytes' % (
+        args.output, len(glyphs), height, cell_width,
+        struct.calcsize(HEADER) + len(glyphs) * (1 + cell_width * ((height + 7) >> 3))))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Converts PNG/BMP images into sprite files for fcb._sprite.Sprite.load
+
+Each pixel is mapped to the closest of white, black and red, and pixels that are
+more than half transparent become the sprite's transparent value. Requires Pillow.
+
+Usage: python mksprite.py [--mono] [--threshold N] input.png output.fcs
+"""
+import sys
+import struct
+import argparse
+
+from PIL import Image
+
+MAGIC = b'FS'
+HEADER = '<2sHHB'
+FLAG_MONO = 1
+FLAG_TRANSPARENT = 2
+
+WHITE = 0
+BLACK = 1
+RED = 2
+TRANSPARENT = 3
+
+PALETTE = (
+    (WHITE, (255, 255, 255)),
+    (BLACK, (0, 0, 0)),
+    (RED, (255, 0, 0)),
+)
+
+
+def classify(pixel, threshold, allow_red):
+    r, g, b, a = pixel
+    if a < threshold:
+        return TRANSPARENT
+    best = None
+    for value, (pr, pg, pb) in PALETTE:
+        if value == RED and not allow_red:
+            continue
+        dist = (r - pr) ** 2 + (g - pg) ** 2 + (b - pb) ** 2
+        if best is None or dist < best[0]:
+            best = (dist, value)
+    return best[1]
+
+
+def pack_gs2(values, width, height):
+    # GS2_HMSB: rows padded to whole bytes, four pixels a byte, first pixel in the low bits
+    stride = (width + 3) >> 2
+    data = bytearray(stride * height)
+    for y in range(height):
+        for x in range(width):
+            data[y * stride + (x >> 2)] |= values[y * width + x] << ((x & 3) << 1)
+    return data
+
+
+def pack_mono(values, width, height):
+    # MONO_HLSB: rows padded to whole bytes, first pixel in the high bit. Set bits are black.
+    stride = (width + 7) >> 3
+    data = bytearray(stride * height)
+    for y in range(height):
+        for x in range(width):
+            if values[y * width + x] == BLACK:
+                data[y * stride + (x >> 3)] |= 0x80 >> (x & 7)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert an image into a badge sprite file")
+    parser.add_argument('--mono', action='store_true', help="write a 1-bpp black and white sprite")
+    parser.add_argument('--threshold', type=int, default=128, help="alpha below which pixels are transparent")
+    parser.add_argument('input')
+    parser.add_argument('output')
+    args = parser.parse_args()
+
+    img = Image.open(args.input).convert('RGBA')
+    width, height = img.size
+    pixels = img.load()
+    values = [classify(pixels[x, y], args.threshold, not args.mono) for y in range(height) for x in range(width)]
+    transparent = TRANSPARENT in values
+
+    flags = 0
+    if transparent:
+        flags |= FLAG_TRANSPARENT
+    if args.mono:
+        flags |= FLAG_MONO
+        # Mono sprites key on clear bits, so white and transparent pixels are the same
+        if transparent:
+            values = [WHITE if v == TRANSPARENT else v for v in values]
+        data = pack_mono(values, width, height)
+    else:
+        data = pack_gs2(values, width, height)
+
+    with open(args.output, 'wb') as fout:
+        fout.write(struct.pack(HEADER, MAGIC, width, height, flags))
+        fout.write(data)
+
+    print('size     ', width, 'x', height)
+    print('format   ', 'mono' if args.mono else 'gs2', '(transparent)' if transparent else '')
+    print('total    ', struct.calcsize(HEADER) + len(data))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,6 +6,8 @@
 #include "py/runtime.h"
 #include "py/gc.h"
 #include "py/obj.h"
+#include "py/misc.h"
+#include "framegen_pack.h"
 
 const mp_obj_type_t framegen_type;
 
@@ -70,9 +72,209 @@ const mp_obj_type_t framegen_type = {
         .iternext = framegen_next,
 };
 
+// pack_planes(src, width, height, black, red[, window])
+//
+// Converts a GS2_HMSB framebuffer of width x height pixels into the two 1bpp
+// planes the panel RAM expects (0x24 B/W and 0x26 red). The panel is mounted
+// in portrait, so each framebuffer column x becomes gate row x of the panel,
+// made of height / 8 bytes with the smallest y in the MSB.
+//
+// This is the transpose of what FrameGen produced: FrameGen walked pixel(col,
+// row) with col running along a gate row, so it read the landscape buffer as
+// if it were portrait. Bit polarity (set = black in the B/W plane, set = red
+// in the red plane) and the MSB first order within a byte are the same.
+//
+// black and red are expected to still hold the last frame sent to the panel.
+// Each byte is compared as it is written, and the bounding box of the bytes
+// that changed is returned as (first row, last row, first column byte, last
+// column byte), or None if the frame is identical. window takes the same form
+// and limits packing to that part of the planes.
+STATIC mp_obj_t framegen_pack_planes(size_t n_args, const mp_obj_t *args) {
+    mp_buffer_info_t src, black, red;
+    mp_get_buffer_raise(args[0], &src, MP_BUFFER_READ);
+    int width = mp_obj_get_int(args[1]);
+    int height = mp_obj_get_int(args[2]);
+    mp_get_buffer_raise(args[3], &black, MP_BUFFER_WRITE);
+    mp_get_buffer_raise(args[4], &red, MP_BUFFER_WRITE);
+
+    int row_bytes = height / 8;
+    size_t plane_len = width * row_bytes;
+    if (width <= 0 || height % 8 != 0 || src.len < (size_t)(width * height / 4) ||
+            black.len < plane_len || red.len < plane_len) {
+        mp_raise_ValueError("bad buffer size");
+    }
+
+    int row0 = 0;
+    int row1 = width - 1;
+    int col0 = 0;
+    int col1 = row_bytes - 1;
+    if (n_args > 5 && args[5] != mp_const_none) {
+        mp_obj_t *window;
+        mp_obj_get_array_fixed_n(args[5], 4, &window);
+        row0 = MAX(mp_obj_get_int(window[0]), 0);
+        row1 = MIN(mp_obj_get_int(window[1]), width - 1);
+        col0 = MAX(mp_obj_get_int(window[2]), 0);
+        col1 = MIN(mp_obj_get_int(window[3]), row_bytes - 1);
+    }
+
+    int changed[4];
+    if (!framegen_pack(src.buf, width, row_bytes, black.buf, red.buf, row0, row1, col0, col1, changed)) {
+        return mp_const_none;
+    }
+    mp_obj_t box[4] = {
+        MP_OBJ_NEW_SMALL_INT(changed[0]),
+        MP_OBJ_NEW_SMALL_INT(changed[1]),
+        MP_OBJ_NEW_SMALL_INT(changed[2]),
+        MP_OBJ_NEW_SMALL_INT(changed[3]),
+    };
+    return mp_obj_new_tuple(4, box);
+}
+STATIC MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(framegen_pack_planes_obj, 5, 6, framegen_pack_planes);
+
+// blank(buf)
+//
+// Returns True if every byte of the buffer is zero, e.g. a plane with no pixels set.
+STATIC mp_obj_t framegen_blank(mp_obj_t buf_in) {
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(buf_in, &bufinfo, MP_BUFFER_READ);
+    const uint8_t *buf = bufinfo.buf;
+    for (size_t i = 0; i < bufinfo.len; i++) {
+        if (buf[i]) {
+            return mp_const_false;
+        }
+    }
+    return mp_const_true;
+}
+STATIC MP_DEFINE_CONST_FUN_OBJ_1(framegen_blank_obj, framegen_blank);
+
+// Batched drawing straight into a GS2_HMSB framebuffer. Each function takes
+// the framebuffer's bytearray, its width and height, an array('h') of
+// coordinates and the colour, clips everything to the framebuffer and
+// returns the bounding box (x0, y0, x1, y1) of what was drawn, or None.
+
+typedef struct _framegen_target_t {
+    uint8_t *buf;
+    int width;
+    int height;
+    uint8_t colour;
+    int x0, y0, x1, y1;
+} framegen_target_t;
+
+STATIC const int16_t *framegen_get_coords(framegen_target_t *target, const mp_obj_t *args, size_t stride, size_t *count) {
+    mp_buffer_info_t fb, coords;
+    mp_get_buffer_raise(args[0], &fb, MP_BUFFER_WRITE);
+    target->width = mp_obj_get_int(args[1]);
+    target->height = mp_obj_get_int(args[2]);
+    mp_get_buffer_raise(args[3], &coords, MP_BUFFER_READ);
+    target->colour = mp_obj_get_int(args[4]) & 0x3;
+    if (target->width <= 0 || target->height <= 0 || fb.len < (size_t)((target->width * target->height + 3) / 4)) {
+        mp_raise_ValueError("bad buffer size");
+    }
+    if (coords.typecode != 'h') {
+        mp_raise_TypeError("coordinates must be array('h')");
+    }
+    target->buf = fb.buf;
+    target->x0 = target->width;
+    target->y0 = target->height;
+    target->x1 = -1;
+    target->y1 = -1;
+    *count = coords.len / (sizeof(int16_t) * stride);
+    return coords.buf;
+}
+
+STATIC void framegen_set_pixel(framegen_target_t *target, int x, int y) {
+    uint8_t *pixel = &target->buf[(x + y * target->width) >> 2];
+    uint8_t shift = (x & 0x3) << 1;
+    *pixel = (target->colour << shift) | (*pixel & ~(0x3 << shift));
+}
+
+// Clips the span from x, y running length pixels along the given axis and
+// draws it
+STATIC void framegen_span(framegen_target_t *target, int x, int y, int length, bool vertical) {
+    int start = vertical ? y : x;
+    int end = start + length - 1;
+    int fixed = vertical ? x : y;
+    int limit = vertical ? target->height : target->width;
+    int fixed_limit = vertical ? target->width : target->height;
+    if (length <= 0 || fixed < 0 || fixed >= fixed_limit || end < 0 || start >= limit) {
+        return;
+    }
+    start = MAX(start, 0);
+    end = MIN(end, limit - 1);
+    for (int i = start; i <= end; i++) {
+        if (vertical) {
+            framegen_set_pixel(target, fixed, i);
+        } else {
+            framegen_set_pixel(target, i, fixed);
+        }
+    }
+    int x0 = vertical ? fixed : start;
+    int y0 = vertical ? start : fixed;
+    int x1 = vertical ? fixed : end;
+    int y1 = vertical ? end : fixed;
+    target->x0 = MIN(target->x0, x0);
+    target->y0 = MIN(target->y0, y0);
+    target->x1 = MAX(target->x1, x1);
+    target->y1 = MAX(target->y1, y1);
+}
+
+STATIC mp_obj_t framegen_target_box(framegen_target_t *target) {
+    if (target->x1 < 0) {
+        return mp_const_none;
+    }
+    mp_obj_t box[4] = {
+        MP_OBJ_NEW_SMALL_INT(target->x0),
+        MP_OBJ_NEW_SMALL_INT(target->y0),
+        MP_OBJ_NEW_SMALL_INT(target->x1),
+        MP_OBJ_NEW_SMALL_INT(target->y1),
+    };
+    return mp_obj_new_tuple(4, box);
+}
+
+// draw_points(buf, width, height, coords, colour), coords holds x, y pairs
+STATIC mp_obj_t framegen_draw_points(size_t n_args, const mp_obj_t *args) {
+    framegen_target_t target;
+    size_t count;
+    const int16_t *coords = framegen_get_coords(&target, args, 2, &count);
+    for (size_t i = 0; i < count; i++) {
+        framegen_span(&target, coords[i * 2], coords[i * 2 + 1], 1, false);
+    }
+    return framegen_target_box(&target);
+}
+STATIC MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(framegen_draw_points_obj, 5, 5, framegen_draw_points);
+
+// draw_hspans(buf, width, height, spans, colour), spans holds x, y, width triples
+STATIC mp_obj_t framegen_draw_hspans(size_t n_args, const mp_obj_t *args) {
+    framegen_target_t target;
+    size_t count;
+    const int16_t *spans = framegen_get_coords(&target, args, 3, &count);
+    for (size_t i = 0; i < count; i++) {
+        framegen_span(&target, spans[i * 3], spans[i * 3 + 1], spans[i * 3 + 2], false);
+    }
+    return framegen_target_box(&target);
+}
+STATIC MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(framegen_draw_hspans_obj, 5, 5, framegen_draw_hspans);
+
+// draw_vspans(buf, width, height, spans, colour), spans holds x, y, height triples
+STATIC mp_obj_t framegen_draw_vspans(size_t n_args, const mp_obj_t *args) {
+    framegen_target_t target;
+    size_t count;
+    const int16_t *spans = framegen_get_coords(&target, args, 3, &count);
+    for (size_t i = 0; i < count; i++) {
+        framegen_span(&target, spans[i * 3], spans[i * 3 + 1], spans[i * 3 + 2], true);
+    }
+    return framegen_target_box(&target);
+}
+STATIC MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(framegen_draw_vspans_obj, 5, 5, framegen_draw_vspans);
+
 STATIC const mp_rom_map_elem_t framegen_module_globals_table[] = {
     { MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_framegen) },
     { MP_ROM_QSTR(MP_QSTR_FrameGen), MP_ROM_PTR(&framegen_type) },
+    { MP_ROM_QSTR(MP_QSTR_pack_planes), MP_ROM_PTR(&framegen_pack_planes_obj) },
+    { MP_ROM_QSTR(MP_QSTR_blank), MP_ROM_PTR(&framegen_blank_obj) },
+    { MP_ROM_QSTR(MP_QSTR_draw_points), MP_ROM_PTR(&framegen_draw_points_obj) },
+    { MP_ROM_QSTR(MP_QSTR_draw_hspans), MP_ROM_PTR(&framegen_draw_hspans_obj) },
+    { MP_ROM_QSTR(MP_QSTR_draw_vspans), MP_ROM_PTR(&framegen_draw_vspans_obj) },
 };
 
 STATIC MP_DEFINE_CONST_DICT(framegen_module_globals, framegen_module_globals_table);
@@ -1,2 +1,4 @@
 from fcb.fcb import FCB, Event, DISP_RESOLUTION
-from fcb._epd import BLACK, WHITE, RED
\ No newline at end of file
+from fcb._epd import BLACK, WHITE, RED
+from fcb._sprite import Sprite, TRANSPARENT
+from fcb._font import FontFile
@@ -1,4 +1,6 @@
 from micropython import const
+import struct
+import time
 
 _ADT75_ADDRESS = const(0x48)
 
@@ -10,12 +12,23 @@ class ADT75:
     A driver for reading the temperate from the ADT75 temperature chip on the badge
     """
 
-    def __init__(self, i2c):
+    def __init__(self, i2c, max_age_ms=60000, smoothing=0.25):
+        """
+        :param i2c: The I2C bus the chip is on
+        :param max_age_ms: How old the cached temperature may get before the chip is read again
+        :param smoothing: Weight given to each new reading in the cached temperature, between 0 and 1
+        """
         self.i2c = i2c
         self._addr = _ADT75_ADDRESS
 
         self.read = lambda r, n: self.i2c.readfrom_mem(self._addr, r, n)
 
+        self.max_age_ms = max_age_ms
+        self.smoothing = smoothing
+        self._temp = None
+        self._sampled_at = 0
+        self._epd_temp = None
+
     def read_temp(self):
         """
         Reads the current temperature
@@ -28,3 +41,46 @@ class ADT75:
         if temp > 2047:
             temp -= 4096
         return temp * 0.0625
+
+    def _stale(self, max_age_ms):
+        return self._temp is None or time.ticks_diff(time.ticks_ms(), self._sampled_at) > max_age_ms
+
+    def _sample(self):
+        sample = self.read_temp()
+        if self._temp is None:
+            self._temp = sample
+        else:
+            self._temp += self.smoothing * (sample - self._temp)
+        self._sampled_at = time.ticks_ms()
+        self._epd_temp = None
+
+    def poll(self):
+        """
+        Reads the chip if the cached temperature is older than ``max_age_ms``. Cheap to call often, e.g. from the main\
+        loop.
+        """
+        if self._stale(self.max_age_ms):
+            self._sample()
+
+    def temperature(self, max_age_ms=None):
+        """
+        The smoothed temperature, only reading the chip if the cached value is too old
+
+        :param max_age_ms: Override for how old the cached value may be
+        :return: The temperature in degrees celsius
+        """
+        if self._stale(self.max_age_ms if max_age_ms is None else max_age_ms):
+            self._sample()
+        return self._temp
+
+    def epd_temp(self):
+        """
+        The cached temperature in the format of the display controller's temperature register (0x1b)
+
+        :return: The two data bytes for the command
+        """
+        self.poll()
+        if self._epd_temp is None:
+            temp_b = struct.pack(">h", int(self._temp * 16))
+            self._epd_temp = bytes((temp_b[1], (temp_b[0] & 0xF) << 4))
+        return self._epd_temp
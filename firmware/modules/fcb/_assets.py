@@ -0,0 +1,98 @@
+import gc
+import os
+from fcb._sprite import Sprite
+
+
+class Assets:
+    """
+    Loads sprites and other assets from the badge's filesystem on first use, and keeps the most recently used ones in\
+    RAM up to a byte budget. When a new asset doesn't fit, the least recently used ones are dropped to make room.
+
+    :param root: The directory assets are loaded from
+    :param budget: How many bytes of asset data to keep loaded at most
+    """
+
+    def __init__(self, root='/assets', budget=8192):
+        self.root = root
+        #: How many bytes of asset data to keep loaded at most
+        self.budget = budget
+        self._cache = {}
+        # Cached names, least recently used first
+        self._order = []
+        self._used = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _size(self, asset):
+        return len(asset.data)
+
+    def _evict(self, need):
+        # Drops the least recently used assets until there is room for another need bytes
+        evicted = False
+        while self._order and self._used + need > self.budget:
+            name = self._order.pop(0)
+            self._used -= self._size(self._cache.pop(name))
+            self._stats['evictions'] += 1
+            evicted = True
+        if evicted:
+            # Hand the memory back before the new asset gets allocated
+            gc.collect()
+
+    def get(self, name, loader=Sprite.load):
+        """
+        Gets an asset, loading it if it isn't already in RAM
+
+        :param name: The file name of the asset, relative to the asset directory
+        :param loader: The function to load the asset with, called with the path of the file. The object it returns\
+        needs a ``data`` attribute holding its buffer, which is what counts towards the budget.
+        :return: The loaded asset
+        """
+        asset = self._cache.get(name)
+        if asset is not None:
+            self._stats['hits'] += 1
+            self._order.remove(name)
+            self._order.append(name)
+            return asset
+        self._stats['misses'] += 1
+        path = self.root + '/' + name
+        # The file size is close enough to what loading it takes to make room up front, unless it won't be kept
+        # anyway
+        size = os.stat(path)[6]
+        if size <= self.budget:
+            self._evict(size)
+        asset = loader(path)
+        size = self._size(asset)
+        # Anything bigger than the whole budget is handed out without being kept
+        if size <= self.budget:
+            self._evict(size)
+            self._cache[name] = asset
+            self._order.append(name)
+            self._used += size
+        return asset
+
+    def drop(self, name=None):
+        """
+        Removes an asset from RAM, or all of them
+
+        :param name: The file name of the asset to remove, or ``None`` to remove everything
+        """
+        names = list(self._order) if name is None else [name]
+        for n in names:
+            if n in self._cache:
+                self._order.remove(n)
+                self._used -= self._size(self._cache.pop(n))
+        gc.collect()
+
+    @property
+    def used(self):
+        """
+        The number of bytes of asset data currently loaded
+        """
+        return self._used
+
+    @property
+    def stats(self):
+        """
+        Cache counters: ``hits`` and ``misses`` count lookups that found the asset loaded or had to load it, and\
+        ``evictions`` how many assets were dropped to stay within the budget.
+        """
+        return self._stats
@@ -0,0 +1,159 @@
+from framebuf import FrameBuffer, GS2_HMSB
+from fcb._surface import Surface, WHITE, BLACK, RED
+from fcb._sprite import TRANSPARENT
+from fcb._gfx import GFX
+from fcb._font import Font
+from fcb._layout import TextBox
+
+
+class Canvas(Surface):
+    """
+    An off-screen drawing surface with its own framebuffer, to be composited onto the display as a layer by\
+    :class:`Compositor`. It has its own :attr:`gfx`, :attr:`font` and :attr:`layout` instances to draw with, in canvas\
+    coordinates.
+
+    :param width: The width of the canvas in pixels, rounded up to a multiple of 4
+    :param height: The height of the canvas in pixels
+    :param x: X location of the canvas on the display
+    :param y: Y location of the canvas on the display
+    :param transparent: ``True`` to start the canvas out transparent, so that anything not drawn on shows the layers\
+    below. :data:`TRANSPARENT <fcb._sprite.TRANSPARENT>` can then be drawn with like any other colour.
+    """
+
+    def __init__(self, width, height, x=0, y=0, transparent=False):
+        super().__init__((width + 3) & ~3, height)
+        #: X location of the canvas on the display
+        self.x = x
+        #: Y location of the canvas on the display
+        self.y = y
+        #: Whether the canvas is shown at all
+        self.visible = True
+        # Makes the canvas usable as a sprite for blitting
+        self.fb = self.buf
+        if transparent:
+            self._colours = frozenset((WHITE, BLACK, RED, TRANSPARENT))
+            self.key = TRANSPARENT
+            self.fill(TRANSPARENT)
+        else:
+            self.key = -1
+        self.gfx = GFX(self.width, self.height, self.set_pixel, self.hline, self.vline, self.fill_rect, self.fill,
+                       self.points, self.hspans, self.vspans, self.blit, self.rect)
+        self.font = Font(self.width, self.height, self.set_pixel, self.points, self.blit, self.fill_rect)
+        self.layout = TextBox(self.font)
+
+    def bounds(self):
+        """
+        Gets the area of the display the canvas covers
+
+        :return: The inclusive box (x0, y0, x1, y1)
+        """
+        return self.x, self.y, self.x + self.width - 1, self.y + self.height - 1
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+class Compositor:
+    """
+    Draws a stack of :class:`Canvas` layers onto a surface, normally the display. Only the area covered by layers\
+    that were drawn on, moved, shown, hidden, added or removed since the last :meth:`compose` is redrawn, so an overlay\
+    coming and going doesn't need the layers below it to be drawn again.
+
+    Each layer keeps a copy of the surface's pixels underneath it, as big as the canvas's own framebuffer. Drawing\
+    straight onto the surface puts those pixels back first, so it never goes over a layer, and when a layer is removed,\
+    hidden or moved what was drawn under it shows again. The layers are put back on top by the next :meth:`compose`.
+
+    :param surface: The surface to composite onto
+    """
+
+    def __init__(self, surface):
+        self._surface = surface
+        # [canvas, box it was last composited at or None, surface pixels under that box] lists, bottom layer first
+        self._layers = []
+        # Area uncovered by removed layers
+        self._exposed = None
+
+    def add(self, canvas, index=None):
+        """
+        Adds a layer
+
+        :param canvas: The canvas to add
+        :param index: Where in the stack to add it, 0 being the bottom. ``None`` puts it on top.
+        """
+        if index is None:
+            index = len(self._layers)
+        under = FrameBuffer(bytearray(canvas.width * canvas.height // 4), canvas.width, canvas.height, GS2_HMSB)
+        self._layers.insert(index, [canvas, None, under])
+
+    def remove(self, canvas):
+        """
+        Removes a layer, the area it covered is redrawn by the next :meth:`compose`
+
+        :param canvas: The canvas to remove
+        """
+        for i, entry in enumerate(self._layers):
+            if entry[0] is canvas:
+                self._uncover()
+                self._exposed = _union(self._exposed, entry[1])
+                del self._layers[i]
+                return
+
+    @property
+    def layers(self):
+        """
+        The canvases in the stack, bottom first
+        """
+        return [entry[0] for entry in self._layers]
+
+    def compose(self):
+        """
+        Redraws the parts of the surface that changed layers cover, and puts the layers back over anything drawn on\
+        the surface since the last time
+        """
+        surface = self._surface
+        # Collect everything that needs redrawing: where changed layers are now and where they used to be
+        box = self._exposed
+        self._exposed = None
+        for canvas, shown, _ in self._layers:
+            now = canvas.bounds() if canvas.visible else None
+            rect = canvas._take_dirty()
+            if now != shown:
+                box = _union(_union(box, shown), now)
+            elif rect is not None and now is not None:
+                box = _union(box, (rect[0] + canvas.x, rect[1] + canvas.y, rect[2] + canvas.x, rect[3] + canvas.y))
+        if box is None and surface._uncover is not None:
+            # No layer changed and nothing was drawn since they were put on the surface
+            return
+        # Take the layers off where they were, keep what's under them where they are now and put them back on top
+        self._uncover()
+        covered = False
+        for entry in self._layers:
+            canvas = entry[0]
+            now = canvas.bounds() if canvas.visible else None
+            entry[1] = now
+            if now is not None:
+                entry[2].blit(surface.buf, -now[0], -now[1])
+                covered = True
+        for canvas, shown, _ in self._layers:
+            if shown is not None:
+                surface.buf.blit(canvas.fb, canvas.x, canvas.y, canvas.key)
+        if covered:
+            surface._uncover = self._uncover
+        # Layers put back unchanged look the same as before, only the changed ones need showing
+        if box is not None:
+            surface._mark(*box)
+
+    def _uncover(self):
+        # Puts the pixels under the layers back on the surface, leaving only what was drawn on it
+        surface = self._surface
+        if surface._uncover is None:
+            return
+        surface._uncover = None
+        for _, shown, under in self._layers:
+            if shown is not None:
+                surface.buf.blit(under, shown[0], shown[1])
@@ -0,0 +1,65 @@
+# Generated by mkcircles.py, do not edit
+from micropython import const
+
+MAX_RADIUS = const(50)
+
+# Half width of each row of a circle, indexed by the distance of the row from the centre. The rows of
+# radius r start at r * (r + 1) // 2.
+TABLE = (
+    b'\x00\x01\x00\x02\x02\x01\x03\x03\x02\x01\x04\x04\x03\x03\x01\x05\x05\x05\x04\x03\x02\x06\x06\x06'
+    b'\x05\x04\x03\x02\x07\x07\x07\x06\x06\x05\x04\x02\x08\x08\x08\x07\x07\x06\x05\x04\x02\x09\x09\x09'
+    b'\x08\x08\x07\x07\x06\x04\x02\x0a\x0a\x0a\x0a\x09\x09\x08\x07\x06\x05\x03\x0b\x0b\x0b\x0b\x0a\x0a'
+    b'\x09\x08\x08\x06\x05\x03\x0c\x0c\x0c\x0c\x0b\x0b\x0a\x0a\x09\x08\x07\x05\x03\x0d\x0d\x0d\x0d\x0c'
+    b'\x0c\x0c\x0b\x0a\x09\x08\x07\x06\x03\x0e\x0e\x0e\x0e\x0d\x0d\x0d\x0c\x0b\x0b\x0a\x09\x07\x06\x03'
+    b'\x0f\x0f\x0f\x0f\x0e\x0e\x0e\x0d\x0d\x0c\x0b\x0a\x09\x08\x06\x03\x10\x10\x10\x10\x0f\x0f\x0f\x0e'
+    b'\x0e\x0d\x0c\x0c\x0b\x09\x08\x06\x03\x11\x11\x11\x11\x11\x10\x10\x0f\x0f\x0e\x0e\x0d\x0c\x0b\x0a'
+    b'\x08\x06\x04\x12\x12\x12\x12\x12\x11\x11\x11\x10\x10\x0f\x0e\x0d\x0c\x0b\x0a\x09\x07\x04\x13\x13'
+    b'\x13\x13\x13\x12\x12\x12\x11\x11\x10\x0f\x0f\x0e\x0d\x0c\x0a\x09\x07\x04\x14\x14\x14\x14\x14\x13'
+    b'\x13\x13\x12\x12\x11\x11\x10\x0f\x0e\x0d\x0c\x0b\x09\x07\x04\x15\x15\x15\x15\x15\x14\x14\x14\x13'
+    b'\x13\x12\x12\x11\x10\x10\x0f\x0e\x0c\x0b\x09\x07\x04\x16\x16\x16\x16\x16\x15\x15\x15\x14\x14\x14'
+    b'\x13\x12\x12\x11\x10\x0f\x0e\x0d\x0b\x0a\x07\x04\x17\x17\x17\x17\x17\x16\x16\x16\x16\x15\x15\x14'
+    b'\x14\x13\x12\x11\x11\x10\x0e\x0d\x0c\x0a\x08\x04\x18\x18\x18\x18\x18\x17\x17\x17\x17\x16\x16\x15'
+    b'\x15\x14\x13\x13\x12\x11\x10\x0f\x0d\x0c\x0a\x08\x04\x19\x19\x19\x19\x19\x18\x18\x18\x18\x17\x17'
+    b'\x16\x16\x15\x15\x14\x13\x12\x11\x10\x0f\x0e\x0c\x0a\x08\x04\x1a\x1a\x1a\x1a\x1a\x1a\x19\x19\x19'
+    b'\x18\x18\x18\x17\x17\x16\x15\x14\x14\x13\x12\x11\x0f\x0e\x0d\x0b\x08\x05\x1b\x1b\x1b\x1b\x1b\x1b'
+    b'\x1a\x1a\x1a\x19\x19\x19\x18\x18\x17\x16\x16\x15\x14\x13\x12\x11\x10\x0e\x0d\x0b\x08\x05\x1c\x1c'
+    b'\x1c\x1c\x1c\x1c\x1b\x1b\x1b\x1b\x1a\x1a\x19\x19\x18\x18\x17\x16\x15\x15\x14\x13\x11\x10\x0f\x0d'
+    b'\x0b\x09\x05\x1d\x1d\x1d\x1d\x1d\x1d\x1c\x1c\x1c\x1c\x1b\x1b\x1a\x1a\x19\x19\x18\x17\x17\x16\x15'
+    b'\x14\x13\x12\x10\x0f\x0d\x0b\x09\x05\x1e\x1e\x1e\x1e\x1e\x1e\x1d\x1d\x1d\x1d\x1c\x1c\x1b\x1b\x1b'
+    b'\x1a\x19\x19\x18\x17\x16\x15\x14\x13\x12\x11\x0f\x0e\x0b\x09\x05\x1f\x1f\x1f\x1f\x1f\x1f\x1e\x1e'
+    b'\x1e\x1e\x1d\x1d\x1d\x1c\x1c\x1b\x1b\x1a\x19\x18\x18\x17\x16\x15\x14\x12\x11\x10\x0e\x0c\x09\x05'
+    b'\x20\x20\x20\x20\x20\x20\x1f\x1f\x1f\x1f\x1e\x1e\x1e\x1d\x1d\x1c\x1c\x1b\x1a\x1a\x19\x18\x17\x16'
+    b'\x15\x14\x13\x11\x10\x0e\x0c\x09\x05\x21\x21\x21\x21\x21\x21\x20\x20\x20\x20\x1f\x1f\x1f\x1e\x1e'
+    b'\x1d\x1d\x1c\x1c\x1b\x1a\x19\x19\x18\x17\x16\x14\x13\x12\x10\x0e\x0c\x09\x05\x22\x22\x22\x22\x22'
+    b'\x22\x21\x21\x21\x21\x20\x20\x20\x1f\x1f\x1f\x1e\x1d\x1d\x1c\x1b\x1b\x1a\x19\x18\x17\x16\x15\x13'
+    b'\x12\x10\x0f\x0c\x09\x05\x23\x23\x23\x23\x23\x23\x22\x22\x22\x22\x22\x21\x21\x20\x20\x20\x1f\x1f'
+    b'\x1e\x1d\x1d\x1c\x1b\x1a\x19\x18\x17\x16\x15\x14\x12\x11\x0f\x0c\x0a\x05\x24\x24\x24\x24\x24\x24'
+    b'\x23\x23\x23\x23\x23\x22\x22\x22\x21\x21\x20\x20\x1f\x1f\x1e\x1d\x1c\x1c\x1b\x1a\x19\x18\x17\x15'
+    b'\x14\x13\x11\x0f\x0d\x0a\x05\x25\x25\x25\x25\x25\x25\x25\x24\x24\x24\x24\x23\x23\x23\x22\x22\x21'
+    b'\x21\x20\x20\x1f\x1e\x1e\x1d\x1c\x1b\x1a\x19\x18\x17\x16\x14\x13\x11\x0f\x0d\x0a\x06\x26\x26\x26'
+    b'\x26\x26\x26\x26\x25\x25\x25\x25\x24\x24\x24\x23\x23\x22\x22\x21\x21\x20\x20\x1f\x1e\x1d\x1d\x1c'
+    b'\x1b\x1a\x19\x17\x16\x15\x13\x11\x0f\x0d\x0a\x06\x27\x27\x27\x27\x27\x27\x27\x26\x26\x26\x26\x25'
+    b'\x25\x25\x24\x24\x24\x23\x23\x22\x21\x21\x20\x1f\x1f\x1e\x1d\x1c\x1b\x1a\x19\x18\x16\x15\x13\x12'
+    b'\x10\x0d\x0a\x06\x28\x28\x28\x28\x28\x28\x28\x27\x27\x27\x27\x26\x26\x26\x25\x25\x25\x24\x24\x23'
+    b'\x23\x22\x21\x21\x20\x1f\x1e\x1e\x1d\x1c\x1b\x19\x18\x17\x15\x14\x12\x10\x0d\x0a\x06\x29\x29\x29'
+    b'\x29\x29\x29\x29\x28\x28\x28\x28\x27\x27\x27\x27\x26\x26\x25\x25\x24\x24\x23\x23\x22\x21\x20\x20'
+    b'\x1f\x1e\x1d\x1c\x1b\x1a\x18\x17\x16\x14\x12\x10\x0e\x0a\x06\x2a\x2a\x2a\x2a\x2a\x2a\x2a\x29\x29'
+    b'\x29\x29\x29\x28\x28\x28\x27\x27\x26\x26\x25\x25\x24\x24\x23\x22\x22\x21\x20\x1f\x1e\x1d\x1c\x1b'
+    b'\x1a\x19\x17\x16\x14\x12\x10\x0e\x0b\x06\x2b\x2b\x2b\x2b\x2b\x2b\x2b\x2a\x2a\x2a\x2a\x2a\x29\x29'
+    b'\x29\x28\x28\x27\x27\x27\x26\x26\x25\x24\x24\x23\x22\x21\x21\x20\x1f\x1e\x1d\x1c\x1a\x19\x18\x16'
+    b'\x15\x13\x10\x0e\x0b\x06\x2c\x2c\x2c\x2c\x2c\x2c\x2c\x2b\x2b\x2b\x2b\x2b\x2a\x2a\x2a\x29\x29\x29'
+    b'\x28\x28\x27\x27\x26\x26\x25\x24\x23\x23\x22\x21\x20\x1f\x1e\x1d\x1c\x1b\x19\x18\x17\x15\x13\x11'
+    b'\x0e\x0b\x06\x2d\x2d\x2d\x2d\x2d\x2d\x2d\x2c\x2c\x2c\x2c\x2c\x2b\x2b\x2b\x2a\x2a\x2a\x29\x29\x28'
+    b'\x28\x27\x27\x26\x25\x25\x24\x23\x22\x22\x21\x20\x1f\x1e\x1c\x1b\x1a\x18\x17\x15\x13\x11\x0e\x0b'
+    b'\x06\x2e\x2e\x2e\x2e\x2e\x2e\x2e\x2d\x2d\x2d\x2d\x2d\x2c\x2c\x2c\x2b\x2b\x2b\x2a\x2a\x29\x29\x28'
+    b'\x28\x27\x27\x26\x25\x24\x24\x23\x22\x21\x20\x1f\x1e\x1d\x1b\x1a\x19\x17\x15\x13\x11\x0e\x0b\x06'
+    b'\x2f\x2f\x2f\x2f\x2f\x2f\x2f\x2e\x2e\x2e\x2e\x2e\x2d\x2d\x2d\x2d\x2c\x2c\x2b\x2b\x2b\x2a\x2a\x29'
+    b'\x28\x28\x27\x26\x26\x25\x24\x23\x22\x21\x20\x1f\x1e\x1d\x1c\x1a\x19\x17\x16\x14\x11\x0f\x0b\x06'
+    b'\x30\x30\x30\x30\x30\x30\x30\x2f\x2f\x2f\x2f\x2f\x2e\x2e\x2e\x2e\x2d\x2d\x2c\x2c\x2c\x2b\x2b\x2a'
+    b'\x2a\x29\x28\x28\x27\x26\x25\x25\x24\x23\x22\x21\x20\x1f\x1d\x1c\x1b\x19\x18\x16\x14\x11\x0f\x0b'
+    b'\x06\x31\x31\x31\x31\x31\x31\x31\x30\x30\x30\x30\x30\x30\x2f\x2f\x2f\x2e\x2e\x2e\x2d\x2d\x2c\x2c'
+    b'\x2b\x2b\x2a\x2a\x29\x28\x27\x27\x26\x25\x24\x23\x22\x21\x20\x1f\x1e\x1c\x1b\x1a\x18\x16\x14\x12'
+    b'\x0f\x0c\x06\x32\x32\x32\x32\x32\x32\x32\x32\x31\x31\x31\x31\x31\x30\x30\x30\x2f\x2f\x2f\x2e\x2e'
+    b'\x2d\x2d\x2c\x2c\x2b\x2b\x2a\x29\x29\x28\x27\x26\x26\x25\x24\x23\x22\x21\x1f\x1e\x1d\x1b\x1a\x18'
+    b'\x16\x14\x12\x0f\x0c\x07'
+)
@@ -0,0 +1,176 @@
+from array import array
+from fcb._epd import WHITE, BLACK, RED
+from fcb._sprite import Sprite
+
+# 4x4 Bayer matrix for ordered dithering, thresholds in sixteenths
+_BAYER = b'\x00\x08\x02\x0a\x0c\x04\x0e\x06\x03\x0b\x01\x09\x0f\x07\x0d\x05'
+
+
+class Dither:
+    """
+    Converts greyscale images into the display's colours one row at a time, so that only a row or two of the image\
+    is ever held in RAM.
+
+    Error diffusion (Floyd-Steinberg) gives the smoothest results for photos and gradients, ordered dithering is\
+    quicker and keeps flat areas regular. Either way, each row comes out as a one pixel high sprite to be drawn with\
+    :meth:`GFX.blit <fcb._gfx.GFX.blit>`.
+
+    :param width: The width of the rows in pixels
+    :param ordered: ``True`` for ordered dithering, ``False`` for error diffusion
+    """
+
+    def __init__(self, width, ordered=False):
+        self.width = width
+        self.ordered = ordered
+        # Error diffused into the current and the next row, in sixteenths. There's a spare entry at each end so the
+        # edge pixels need no special cases.
+        self._err = array('h', bytes(2 * (width + 2)))
+        self._next = array('h', bytes(2 * (width + 2)))
+        # The same for the red channel, only allocated once a red row comes along
+        self._red_err = None
+        self._red_next = None
+        self._row = Sprite(width, 1)
+        self._y = 0
+
+    def reset(self):
+        """
+        Starts a new image, forgetting the error carried over from the previous rows
+        """
+        for errs in (self._err, self._next, self._red_err, self._red_next):
+            if errs is not None:
+                for i in range(len(errs)):
+                    errs[i] = 0
+        self._y = 0
+
+    def row(self, grey, red=None):
+        """
+        Dithers the next row of the image
+
+        :param grey: The brightness of each pixel in the row, from 0 for black to 255 for white
+        :param red: Optionally, how red each pixel in the row is, from 0 to 255. Pixels come out red in proportion to\
+        this, whatever their brightness.
+        :return: The row as a one pixel high :class:`Sprite <fcb._sprite.Sprite>`. It's reused for the next row.
+        """
+        if red is not None and self._red_err is None:
+            self._red_err = array('h', bytes(2 * (self.width + 2)))
+            self._red_next = array('h', bytes(2 * (self.width + 2)))
+        if self.ordered:
+            self._ordered_row(grey, red)
+        else:
+            self._diffuse_row(grey, red)
+        self._y += 1
+        return self._row
+
+    def _ordered_row(self, grey, red):
+        data = self._row.data
+        bayer = _BAYER
+        base = (self._y & 3) << 2
+        acc = 0
+        for x in range(self.width):
+            threshold = (bayer[base + (x & 3)] << 4) + 8
+            if red is not None and red[x] >= threshold:
+                c = RED
+            elif grey[x] >= threshold:
+                c = WHITE
+            else:
+                c = BLACK
+            acc |= c << ((x & 3) << 1)
+            if x & 3 == 3:
+                data[x >> 2] = acc
+                acc = 0
+        if self.width & 3:
+            data[self.width >> 2] = acc
+
+    def _diffuse_row(self, grey, red):
+        data = self._row.data
+        err = self._err
+        nxt = self._next
+        red_err = self._red_err
+        red_nxt = self._red_next
+        acc = 0
+        for x in range(self.width):
+            # Entry i of the error rows belongs to pixel i - 1
+            v = grey[x] + (err[x + 1] >> 4)
+            err[x + 1] = 0
+            c = BLACK
+            if red is not None:
+                r = red[x] + (red_err[x + 1] >> 4)
+                red_err[x + 1] = 0
+                if r >= 128:
+                    # The grey error of a red pixel is dropped, red says nothing about brightness
+                    c = RED
+                    r -= 255
+                red_err[x + 2] += r * 7
+                red_nxt[x] += r * 3
+                red_nxt[x + 1] += r * 5
+                red_nxt[x + 2] += r
+            if c != RED:
+                if v >= 128:
+                    c = WHITE
+                    v -= 255
+                err[x + 2] += v * 7
+                nxt[x] += v * 3
+                nxt[x + 1] += v * 5
+                nxt[x + 2] += v
+            acc |= c << ((x & 3) << 1)
+            if x & 3 == 3:
+                data[x >> 2] = acc
+                acc = 0
+        if self.width & 3:
+            data[self.width >> 2] = acc
+        # The current row has been zeroed as it was read apart from the spare entries, swap it in as the next row
+        err[0] = err[self.width + 1] = 0
+        self._err, self._next = nxt, err
+        if red is not None:
+            red_err[0] = red_err[self.width + 1] = 0
+            self._red_err, self._red_next = red_nxt, red_err
+
+    def draw(self, gfx, x, y, rows):
+        """
+        Dithers a whole image and draws it as it goes
+
+        :param gfx: The :class:`GFX <fcb._gfx.GFX>` instance to draw with
+        :param x: X component of the location of the top left corner of the image
+        :param y: Y component of the location of the top left corner of the image
+        :param rows: An iterable of the rows of the image, each either a buffer of grey values or a (grey, red) pair.\
+        A generator reading them from a file keeps the image out of RAM.
+        """
+        for i, row in enumerate(rows):
+            if isinstance(row, tuple):
+                sprite = self.row(*row)
+            else:
+                sprite = self.row(row)
+            gfx.blit(sprite, x, y + i)
+
+
+def _pgm_rows(f, width, height):
+    # Reads a row at a time into the same buffer
+    buf = bytearray(width)
+    for _ in range(height):
+        if f.readinto(buf) != width:
+            raise ValueError("PGM file truncated")
+        yield buf
+
+
+def draw_pgm(gfx, path, x, y, ordered=False):
+    """
+    Dithers a binary (P5) PGM greyscale image from the filesystem onto the display, reading it a row at a time
+
+    :param gfx: The :class:`GFX <fcb._gfx.GFX>` instance to draw with
+    :param path: The path of the image file
+    :param x: X component of the location of the top left corner of the image
+    :param y: Y component of the location of the top left corner of the image
+    :param ordered: ``True`` for ordered dithering, ``False`` for error diffusion
+    """
+    with open(path, 'rb') as f:
+        # The header is the magic, width, height and maximum value, separated by whitespace and comments
+        fields = []
+        while len(fields) < 4:
+            line = f.readline()
+            if not line:
+                raise ValueError("PGM header truncated")
+            fields.extend(line.split(b'#')[0].split())
+        if fields[0] != b'P5' or fields[3] != b'255':
+            raise ValueError("Only 8-bit binary PGM files are supported")
+        width, height = int(fields[1]), int(fields[2])
+        Dither(width, ordered).draw(gfx, x, y, _pgm_rows(f, width, height))
@@ -1,27 +1,123 @@
 from micropython import const
 import struct
-from framebuf import FrameBuffer, GS2_HMSB
-from framegen import FrameGen
+from framegen import pack_planes, blank
 import time
-
-WHITE = const(0)
-BLACK = const(1)
-RED = const(2)
+from fcb._surface import Surface, WHITE, BLACK, RED
 
 _SPI_COMMAND = False
 _SPI_DATA = True
 
+# The busy pin only goes high a little after an update is triggered
+_BUSY_SETTLE_MS = const(50)
+_BUSY_POLL_MS = const(5)
+
+# Auto Write Red RAM (0x46) pattern: first step value 0, step height 296, step width 128, so the whole RAM is zeroed
+_RED_RAM_CLEAR = const(0x64)
+# Bytes of a narrow window's rows gathered into each SPI write
+_WINDOW_CHUNK = const(512)
+
 RESOLUTION = ((296, 128), (128, 296))
 
 
-class EPD:
+# Waveforms are 5 LUTs of 7 phases (4 sub-phases each) followed by the timing of each phase
+_LUT_FULL = bytes((
+    # Phase 0     Phase 1     Phase 2     Phase 3     Phase 4     Phase 5     Phase 6
+    # A B C D     A B C D     A B C D     A B C D     A B C D     A B C D     A B C D
+    0b01001000, 0b10100000, 0b00010000, 0b00010000, 0b00010011, 0b00000000, 0b00000000,  # LUT0 - Black
+    0b01001000, 0b10100000, 0b10000000, 0b00000000, 0b00000011, 0b00000000, 0b00000000,  # LUTT1 - White
+    0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # IGNORE
+    0b01001000, 0b10100101, 0b00000000, 0b10111011, 0b00000000, 0b00000000, 0b00000000,  # LUT3 - Red
+    0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # LUT4 - VCOM
+
+    # Duration            |  Repeat
+    # A   B     C     D   |
+    64,   12,   32,   12,    6,   # 0 Flash
+    16,   8,    4,    4,     6,   # 1 clear
+    4,    8,    8,    16,    16,  # 2 bring in the black
+    2,    2,    2,    64,    32,  # 3 time for red
+    2,    2,    2,    2,     2,   # 4 final black sharpen phase
+    0,    0,    0,    0,     0,   # 5
+    0,    0,    0,    0,     0    # 6
+))
+
+_LUT_BW = bytes((
+    # Phase 0     Phase 1     Phase 2     Phase 3     Phase 4     Phase 5     Phase 6
+    # A B C D     A B C D     A B C D     A B C D     A B C D     A B C D     A B C D
+    0b01001000, 0b10100000, 0b00010000, 0b00000000, 0b00010011, 0b00000000, 0b00000000,  # LUT0 - Black
+    0b01001000, 0b10100000, 0b10000000, 0b00000000, 0b00000011, 0b00000000, 0b00000000,  # LUTT1 - White
+    0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # IGNORE
+    0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # LUT3 - Red
+    0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # LUT4 - VCOM
+
+    # Duration            |  Repeat
+    # A   B     C     D   |
+    64,   12,   32,   12,    6,   # 0 Flash
+    16,   8,    4,    4,     6,   # 1 clear
+    4,    8,    8,    16,    16,  # 2 bring in the black
+    0,    0,    0,    0,     0,   # 3 no red to bring in
+    2,    2,    2,    2,     2,   # 4 final black sharpen phase
+    0,    0,    0,    0,     0,   # 5
+    0,    0,    0,    0,     0    # 6
+))
+
+_LUT_PARTIAL = bytes((
+    # Phase 0     Phase 1     Phase 2     Phase 3     Phase 4     Phase 5     Phase 6
+    # A B C D     A B C D     A B C D     A B C D     A B C D     A B C D     A B C D
+    0b00010000, 0b00010011, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # LUT0 - Black
+    0b10000000, 0b00000011, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # LUTT1 - White
+    0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # IGNORE
+    0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # LUT3 - Red
+    0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # LUT4 - VCOM
+
+    # Duration            |  Repeat
+    # A   B     C     D   |
+    4,    8,    8,    16,    4,   # 0 bring in the black, no flash or clear
+    2,    2,    2,    2,     2,   # 1 final black sharpen phase
+    0,    0,    0,    0,     0,   # 2
+    0,    0,    0,    0,     0,   # 3
+    0,    0,    0,    0,     0,   # 4
+    0,    0,    0,    0,     0,   # 5
+    0,    0,    0,    0,     0    # 6
+))
+
+
+def _retime(lut, num, den):
+    # Scales the repeat count of every phase, the particles move slower in the cold and faster in the warm
+    lut = bytearray(lut)
+    for i in range(39, len(lut), 5):
+        if lut[i]:
+            lut[i] = max(1, lut[i] * num // den)
+    return bytes(lut)
+
+
+# For each refresh mode, (upper temperature bound in C, waveform) from the coldest band to the warmest
+_LUTS = {
+    'full': ((10, _retime(_LUT_FULL, 3, 2)), (30, _LUT_FULL), (None, _retime(_LUT_FULL, 2, 3))),
+    'bw': ((10, _retime(_LUT_BW, 3, 2)), (30, _LUT_BW), (None, _retime(_LUT_BW, 2, 3))),
+    'partial': ((10, _retime(_LUT_PARTIAL, 3, 2)), (30, _LUT_PARTIAL), (None, _retime(_LUT_PARTIAL, 2, 3))),
+}
+
+
+def _compile_script(commands):
+    # Packs (command, data) pairs into command byte, data length, data... as expected by EPSPI.write_script()
+    script = bytearray()
+    for command, data in commands:
+        script.append(command)
+        script.append(len(data))
+        script.extend(data)
+    return bytes(script)
+
+
+class EPD(Surface):
     def __init__(self, spi, cs_pin, reset_pin, busy_pin, adt):
+        super().__init__(*RESOLUTION[0])
 
         self.resolution = RESOLUTION[0]
-        self.width, self.height = RESOLUTION[0]
         self.cols, self.rows = RESOLUTION[1]
 
-        self.buf = FrameBuffer(bytearray(self.width * self.height // 4), self.width, self.height, GS2_HMSB)
+        # The B/W and red planes of the last frame sent to the panel
+        self._planes = (bytearray(self.cols * self.rows // 8), bytearray(self.cols * self.rows // 8))
+        self._full_window = (0, self.rows - 1, 0, self.cols // 8 - 1)
         self.border_colour = 0
 
         self._reset_pin = reset_pin
@@ -30,142 +126,280 @@ class EPD:
         self._spi = spi
         self._adt = adt
 
-        self._dirty = False
-
-        self._luts = {
-            'default': [
-                # Phase 0     Phase 1     Phase 2     Phase 3     Phase 4     Phase 5     Phase 6
-                # A B C D     A B C D     A B C D     A B C D     A B C D     A B C D     A B C D
-                0b01001000, 0b10100000, 0b00010000, 0b00010000, 0b00010011, 0b00000000, 0b00000000,  # LUT0 - Black
-                0b01001000, 0b10100000, 0b10000000, 0b00000000, 0b00000011, 0b00000000, 0b00000000,  # LUTT1 - White
-                0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # IGNORE
-                0b01001000, 0b10100101, 0b00000000, 0b10111011, 0b00000000, 0b00000000, 0b00000000,  # LUT3 - Red
-                0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000, 0b00000000,  # LUT4 - VCOM
-
-                # Duration            |  Repeat
-                # A   B     C     D   |
-                64,   12,   32,   12,    6,   # 0 Flash
-                16,   8,    4,    4,     6,   # 1 clear
-                4,    8,    8,    16,    16,  # 2 bring in the black
-                2,    2,    2,    64,    32,  # 3 time for red
-                2,    2,    2,    2,     2,   # 4 final black sharpen phase
-                0,    0,    0,    0,     0,   # 5
-                0,    0,    0,    0,     0    # 6
-            ]
-        }
+        # The panel RAM only holds the current frame after the first full upload
+        self._ram_valid = False
+        # Whether the panel's red RAM holds any red, None until the first upload
+        self._panel_red = None
+        #: How long to wait for the busy pin before giving up on the controller
+        self.busy_timeout_ms = 30000
+        # ticks_ms() when the running panel update was triggered, None when idle
+        self._refresh_start = None
+        self._update_start = 0
+        #: Keep the controller initialised between refreshes instead of putting it into deep sleep after each one
+        self.warm = False
+        # The waveform loaded into the controller while it is awake, None while it is reset or asleep
+        self._awake_lut = None
+        self._scripts = {}
+        self._stats = {'cold': 0, 'wake': 0, 'warm': 0, 'timeouts': 0, 'init_ms': 0, 'panel_ms': 0, 'refresh_ms': 0}
+        #: Use the quick B/W only waveform for windowed updates. Red pixels are not driven with it, so windows with red
+        #: in them, before or after, still get the full waveform.
+        self.fast_partial = False
+        # Reused for single byte commands and data so they don't allocate
+        self._scalar = bytearray(1)
+        # Reused for gathering the rows of windows narrower than the planes
+        self._chunk = bytearray(_WINDOW_CHUNK)
 
     def setup(self):
+        self._reset(0.1)
+
+    def _reset(self, delay):
         self._reset_pin.off()
-        time.sleep(0.1)
+        time.sleep(delay)
         self._reset_pin.on()
-        time.sleep(0.1)
+        time.sleep(delay)
 
         self._send_command(0x12)  # Soft Reset
         self._busy_wait()
+        self._awake_lut = None
 
     def _busy_wait(self):
-        return
+        start = time.ticks_ms()
         while self._busy_pin.value():
-            time.sleep(0.01)
-
-    def _update(self, buf_a, buf_b):
-        self.setup()
-
-        packed_height = list(struct.pack('<H', self.rows))
-
-        self._send_command(0x74, 0x54)  # Set Analog Block Control
-        self._send_command(0x7e, 0x3b)  # Set Digital Block Control
-
-        self._send_command(0x01, packed_height + [0x00])  # Gate setting
-
-        self._send_command(0x03, [0b10000, 0b0001])  # Gate Driving Voltage
-
-        self._send_command(0x3a, 0x07)  # Dummy line period
-        self._send_command(0x3b, 0x04)  # Gate line width
-        self._send_command(0x11, 0x03)  # Data entry mode setting 0x03 = X/Y increment
-
-        self._send_command(0x04)  # Power On
-        self._send_command(0x2c, 0x3c)  # VCOM Register, 0x3c = -1.5v?
+            if time.ticks_diff(time.ticks_ms(), start) > self.busy_timeout_ms:
+                self._stats['timeouts'] += 1
+                return
+            time.sleep_ms(_BUSY_POLL_MS)
+
+    def poll(self):
+        """
+        Checks on a panel update started by ``show(block=False)``, finishing it off once the panel is done.
+
+        GPIO16 can't raise interrupts on the ESP8266, so this watches the busy pin's level instead and should be called\
+        regularly, e.g. from the main loop.
+
+        :return: ``True`` while the panel is still updating
+        """
+        if self._refresh_start is None:
+            return False
+        elapsed = time.ticks_diff(time.ticks_ms(), self._refresh_start)
+        if elapsed < _BUSY_SETTLE_MS:
+            return True
+        if self._busy_pin.value():
+            if elapsed < self.busy_timeout_ms:
+                return True
+            self._stats['timeouts'] += 1
+        self._finish_update()
+        return False
 
-        self._send_command(0x3c, 0x00)
-        self._send_command(0x3c, 0xFF)
+    @property
+    def busy(self):
+        """
+        ``True`` while a panel update is in progress. This only checks, it's :meth:`poll` that notices the panel\
+        finishing and finishes the update off.
+        """
+        return self._refresh_start is not None
+
+    def wait(self):
+        """
+        Blocks until any panel update in progress has finished
+        """
+        while self.poll():
+            time.sleep_ms(_BUSY_POLL_MS)
+
+    def sleep(self):
+        """
+        Puts the controller into deep sleep. Only needed in warm mode, otherwise this happens after every refresh.
+        """
+        self.wait()
+        if self._awake_lut is not None:
+            self._send_command(0x10, 0x01)  # Enter Deep Sleep
+            self._awake_lut = None
 
-        self._send_command(0x32, self._luts['default'])  # Set LUTs
+    @property
+    def stats(self):
+        """
+        Refresh timing counters. ``init_ms``, ``panel_ms`` (time the panel spent busy) and ``refresh_ms`` are for\
+        the last refresh, ``cold``, ``wake`` and ``warm`` count how the controller was brought up for each refresh and\
+        ``timeouts`` how often the busy pin never cleared.
+        """
+        return self._stats
+
+    def _select_lut(self, mode):
+        temp = self._adt.temperature()
+        for max_temp, lut in _LUTS[mode]:
+            if max_temp is None or temp < max_temp:
+                return lut
+
+    def _init_script(self, lut):
+        # The register setup after a reset, compiled once per waveform into a blob that EPSPI.write_script() sends
+        # in one burst
+        script = self._scripts.get(lut)
+        if script is None:
+            packed_height = struct.pack('<H', self.rows)
+            script = _compile_script((
+                (0x74, b'\x54'),  # Set Analog Block Control
+                (0x7e, b'\x3b'),  # Set Digital Block Control
+                (0x01, packed_height + b'\x00'),  # Gate setting
+                (0x03, bytes((0b10000, 0b0001))),  # Gate Driving Voltage
+                (0x3a, b'\x07'),  # Dummy line period
+                (0x3b, b'\x04'),  # Gate line width
+                (0x11, b'\x03'),  # Data entry mode setting 0x03 = X/Y increment
+                (0x04, b''),  # Power On
+                (0x2c, b'\x3c'),  # VCOM Register, 0x3c = -1.5v?
+                (0x3c, b'\x00'),
+                (0x3c, b'\xff'),
+                (0x32, lut),  # Set LUTs
+            ))
+            self._scripts[lut] = script
+        return script
+
+    def _set_window(self, window):
+        row0, row1, col0, col1 = window
+        self._send_command(0x44, bytes((col0, col1)))  # Set RAM X Start/End
+        self._send_command(0x45, struct.pack('<HH', row0, row1))  # Set RAM Y Start/End
+
+    def _update(self, buf_a, buf_b, window, mode='full', clear_red=False):
+        start = time.ticks_ms()
+        lut = self._select_lut(mode)
+        if self._awake_lut is None:
+            # A cold start gets the full reset delays, waking from deep sleep only needs a short pulse
+            if self._stats['cold']:
+                self._reset(0.01)
+                self._stats['wake'] += 1
+            else:
+                self.setup()
+                self._stats['cold'] += 1
+            self._spi.write_script(self._init_script(lut))
+        else:
+            if self._awake_lut is not lut:
+                self._send_command(0x32, lut)  # Set LUTs
+            self._stats['warm'] += 1
+        self._awake_lut = lut
+        init_done = time.ticks_ms()
+
+        if clear_red:
+            self._set_window(self._full_window)
+            self._send_command(0x4e, 0x00)  # Set RAM X Pointer Start
+            self._send_command(0x4f, b'\x00\x00')  # Set RAM Y Pointer Start
+            self._send_command(0x46, _RED_RAM_CLEAR)  # Auto Write Red RAM
+            self._busy_wait()
 
-        self._send_command(0x44, [0x00, (self.cols // 8) - 1])  # Set RAM X Start/End
-        self._send_command(0x45, [0x00, 0x00] + packed_height)  # Set RAM Y Start/End
+        row0, row1, col0, col1 = window
+        row_bytes = self.cols // 8
+        packed_row0 = struct.pack('<H', row0)
+        self._set_window(window)
 
         # 0x24 == RAM B/W, 0x26 == RAM Red
         for data in ((0x24, buf_a), (0x26, buf_b)):
             cmd, buf = data
-            self._send_command(0x4e, 0x00)  # Set RAM X Pointer Start
-            self._send_command(0x4f, [0x00, 0x00])  # Set RAM Y Pointer Start
-            self._send_command(cmd, buf)
-
-        temp = self._adt.read_temp()
-        temp_b = struct.pack(">h", int(temp*16))
-        temp0 = (temp_b[0] & 0xF) << 4
-        temp1 = temp_b[1]
-        self._send_command(0x1b, [temp1, temp0])
+            if buf is None:
+                continue
+            self._send_command(0x4e, col0)  # Set RAM X Pointer Start
+            self._send_command(0x4f, packed_row0)  # Set RAM Y Pointer Start
+            self._send_command(cmd)
+            buf = memoryview(buf)
+            if col0 == 0 and col1 == row_bytes - 1:
+                self._send_data(buf[row0 * row_bytes:(row1 + 1) * row_bytes])
+            else:
+                # The RAM pointer wraps to the next row at the window edge, so the rows just follow each other. They're
+                # gathered into a fixed buffer and sent a chunk of rows at a time rather than one write per row.
+                width = col1 - col0 + 1
+                chunk = self._chunk
+                size = len(chunk) - len(chunk) % width
+                i = 0
+                for row in range(row0 * row_bytes, (row1 + 1) * row_bytes, row_bytes):
+                    chunk[i:i + width] = buf[row + col0:row + col1 + 1]
+                    i += width
+                    if i == size:
+                        self._send_data(chunk if i == len(chunk) else memoryview(chunk)[:i])
+                        i = 0
+                if i:
+                    self._send_data(memoryview(chunk)[:i])
+
+        self._send_command(0x1b, self._adt.epd_temp())  # Temperature for the waveform
 
         self._send_command(0x22, 0xc7)  # Display Update Sequence
         self._send_command(0x20)  # Trigger Display Update
-        time.sleep(0.05)
-        self._busy_wait()
-        self._send_command(0x10, 0x01)  # Enter Deep Sleep
-        self._dirty = False
-
-    def set_pixel(self, x, y, v):
-        if v in (WHITE, BLACK, RED):
-            self.buf.pixel(x, y, v)
-            self._dirty = True
-
-    def hline(self, x, y, w, v):
-        if v in (WHITE, BLACK, RED):
-            self.buf.hline(x, y, w, v)
-            self._dirty = True
-
-    def vline(self, x, y, h, v):
-        if v in (WHITE, BLACK, RED):
-            self.buf.hline(x, y, h, v)
-            self._dirty = True
-
-    @property
-    def dirty(self):
-        return self._dirty
-
-    def show(self):
-        def gen_buf_a():
-            for row in range(self.rows):
-                for col in range(0, self.cols, 8):
-                    out = 0
-                    for i in range(8):
-                        if self.buf.pixel(col+i, row) == BLACK:
-                            out += 1 << (7-i)
-                    yield out
-
-        def gen_buf_b():
-            for row in range(self.rows):
-                for col in range(0, self.cols, 8):
-                    out = 0
-                    for i in range(8):
-                        if self.buf.pixel(col+i, row) == RED:
-                            out += 1 << (7-i)
-                    yield out
-
-        self._update(FrameGen(self.cols, self.rows, BLACK, self.buf.pixel),
-                     FrameGen(self.cols, self.rows, RED, self.buf.pixel))
+        self._refresh_start = time.ticks_ms()
+        self._update_start = start
+        self._ram_valid = True
+        self._stats['init_ms'] = time.ticks_diff(init_done, start)
+
+    def _finish_update(self):
+        now = time.ticks_ms()
+        self._stats['panel_ms'] = time.ticks_diff(now, self._refresh_start)
+        self._stats['refresh_ms'] = time.ticks_diff(now, self._update_start)
+        self._refresh_start = None
+        if not self.warm:
+            self.sleep()
+
+    def _window(self):
+        # Panel RAM window (first row, last row, first column byte, last column byte) covering the dirty area.
+        # Framebuffer x runs down the panel's gate rows and y across its column bytes.
+        rect = self._dirty_rect
+        if rect is None or not self._ram_valid:
+            return self._full_window
+        x0, y0, x1, y1 = rect
+        return x0, x1, y0 // 8, y1 // 8
+
+    def _blank_window(self, plane, window):
+        # Whether a plane has nothing set inside a panel RAM window
+        row0, row1, col0, col1 = window
+        row_bytes = self.cols // 8
+        plane = memoryview(plane)
+        for row in range(row0 * row_bytes, (row1 + 1) * row_bytes, row_bytes):
+            if not blank(plane[row + col0:row + col1 + 1]):
+                return False
+        return True
+
+    def show(self, block=True):
+        """
+        Sends the framebuffer to the panel.
+
+        ``buf`` acts as the back buffer and the packed planes as the front buffer: the frame is converted into the\
+        planes and uploaded before the panel starts updating, so drawing can carry on while it does. Anything drawn\
+        during an update is picked up by the next call, however many redraws happened in between.
+
+        :param block: Whether to wait for the panel to finish updating
+        """
+        # The controller can't take new data until the previous update is done
+        self.wait()
+        black, red = self._planes
+        # The quick waveform leaves red pixels as they are, so it can't be used where red is going away either
+        red_before = self.fast_partial and self._ram_valid and not self._blank_window(red, self._window())
+        # The planes still hold the frame on the panel, so packing over them yields the area that really changed
+        window = pack_planes(self._buf_data, self.width, self.height, black, red, self._window())
+        self._take_dirty()
+        if not self._ram_valid:
+            window = self._full_window
+        elif window is None:
+            return
+        full = window == self._full_window
+        # Most screens are only black and white. Those skip the red plane, the red RAM gets cleared with a single
+        # command if it still holds red, and the waveform without the long red phase is used.
+        has_red = not blank(red)
+        if self.fast_partial and not full and not red_before and (not has_red or self._blank_window(red, window)):
+            mode = 'partial'
+        else:
+            mode = 'full' if has_red else 'bw'
+        clear_red = not has_red and self._panel_red is not False
+        self._update(black, red if has_red else None, window, mode, clear_red)
+        self._panel_red = has_red
+        if block:
+            self.wait()
 
     def _spi_write(self, dc, values):
         self._spi.write(values, dc)
 
     def _send_command(self, command, data=None):
-        self._spi_write(_SPI_COMMAND, [command])
+        self._scalar[0] = command
+        self._spi_write(_SPI_COMMAND, self._scalar)
         if data is not None:
             self._send_data(data)
 
     def _send_data(self, data):
         if isinstance(data, int):
-            data = [data]
+            self._scalar[0] = data
+            data = self._scalar
         self._spi_write(_SPI_DATA, data)
 
@@ -1,3 +1,19 @@
+from micropython import const
+from array import array
+import struct
+from framebuf import FrameBuffer, GS2_HMSB
+from fcb._surface import WHITE, BLACK, RED
+from fcb._sprite import Sprite, TRANSPARENT, packed_size
+
+# Font files are read through a cache of this many pages of this many bytes
+_PAGE_SIZE = const(64)
+_PAGE_COUNT = const(8)
+
+# Proportional font file header: magic, cell width, height, first character, character count
+_MAGIC = b'FF'
+_HEADER = '<2sBBBH'
+_HEADER_SIZE = const(7)
+
 _FONT = bytes((
     0x00, 0x00, 0x00, 0x00, 0x00,
     0x3E, 0x5B, 0x4F, 0x5B, 0x3E,
@@ -258,70 +274,409 @@ _FONT = bytes((
 ))
 
 
+class _BuiltinFace:
+    # The fixed 5x8 font compiled into the firmware, read straight out of flash
+    width = 5
+    height = 8
+
+    def glyph_width(self, code):
+        return 5
+
+    def column(self, code, x):
+        return _FONT[code * 5 + x] if code < 256 else 0
+
+
+_BUILTIN = _BuiltinFace()
+
+
+class _Glyph:
+    # Passed to the blit function in place of a Sprite. It has no pixels of its own, it's pointed at each rendered
+    # glyph's framebuffer and sized to it before being blitted.
+    key = TRANSPARENT
+
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.fb = None
+
+
+class FontFile:
+    """
+    A bitmap font read from a file as it's needed, through a small page cache rather than loading it into RAM.\
+    Pass it to :attr:`Font.face` to draw with it.
+
+    Two formats are understood. The original fixed width format is:
+
+    - 1 unsigned byte: character width in pixels
+    - 1 unsigned byte: character height in pixels
+    - font data for all 256 characters in order
+
+    The proportional format, as written by ``mkfont.py`` in the firmware directory, is:
+
+    - 2 bytes: ``FF``
+    - 1 unsigned byte: width of the widest character in pixels
+    - 1 unsigned byte: character height in pixels
+    - 1 unsigned byte: code of the first character
+    - 1 little endian unsigned short: number of characters
+    - 1 unsigned byte per character: its width in pixels
+    - font data for each character, padded out to the widest character
+
+    The font data of a character has a column after another, left to right. Each column is as many bytes as it\
+    takes to hold a bit per row, the lowest bit of the first byte being the top row. Characters missing from a font\
+    are drawn blank.
+
+    :param path: The path of the font file
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        header = self._file.read(_HEADER_SIZE)
+        if header[:2] == _MAGIC:
+            _, self.width, self.height, self._first, self._count = struct.unpack(_HEADER, header)
+            # Kept in RAM so measuring text never touches the file
+            self._widths = self._file.read(self._count)
+            self._data = _HEADER_SIZE + self._count
+        else:
+            self.width, self.height = header[0], header[1]
+            self._first = 0
+            self._count = 256
+            self._widths = None
+            self._data = 2
+        self._column_bytes = (self.height + 7) >> 3
+        self._glyph_bytes = self.width * self._column_bytes
+        # Cached pages keyed by page number, and the page numbers least recently used first
+        self._pages = {}
+        self._page_order = []
+
+    def close(self):
+        """
+        Closes the font file
+        """
+        self._file.close()
+
+    def glyph_width(self, code):
+        """
+        Gets the width of a character
+
+        :param code: The character code
+        :return: The width of the character in pixels, not counting the gap after it
+        """
+        i = code - self._first
+        if self._widths is None or i < 0 or i >= self._count:
+            return self.width
+        return self._widths[i]
+
+    def _page(self, page):
+        data = self._pages.get(page)
+        order = self._page_order
+        if data is not None:
+            if order[-1] != page:
+                order.remove(page)
+                order.append(page)
+            return data
+        # Reuse the least recently used page's buffer once the cache is full
+        if len(order) >= _PAGE_COUNT:
+            data = self._pages.pop(order.pop(0))
+        else:
+            data = bytearray(_PAGE_SIZE)
+        self._file.seek(page * _PAGE_SIZE)
+        self._file.readinto(data)
+        self._pages[page] = data
+        order.append(page)
+        return data
+
+    def column(self, code, x):
+        """
+        Gets a column of a character's bitmap
+
+        :param code: The character code
+        :param x: The column, counting from the left
+        :return: The column as an integer, bit 0 being the top row
+        """
+        i = code - self._first
+        if i < 0 or i >= self._count:
+            return 0
+        offset = self._data + i * self._glyph_bytes + x * self._column_bytes
+        bits = 0
+        for b in range(self._column_bytes):
+            bits |= self._page((offset + b) // _PAGE_SIZE)[(offset + b) % _PAGE_SIZE] << (b << 3)
+        return bits
+
+
 class Font:
     """
-    A class for writing text onto the display framebuffer. The font is a fixed 5x8 font.
+    A class for writing text onto the display framebuffer. It uses a fixed 5x8 font unless another :attr:`face` is\
+    given.
     """
 
-    def __init__(self, width, height, pixel):
+    def __init__(self, width, height, pixel, points=None, blit=None, fill_rect=None, cache_budget=2048, face=None):
         # Specify the drawing area width and height, and the pixel function to
         # call when drawing pixels (should take an x and y param at least).
-        # Optionally specify font_name to override the font file to use (default
-        # is font5x8.bin).  The font format is a binary file with the following
-        # format:
-        # - 1 unsigned byte: font character width in pixels
-        # - 1 unsigned byte: font character height in pixels
-        # - x bytes: font data, in ASCII order covering all 255 characters.
-        #            Each character should have a byte for each pixel column of
-        #            data (i.e. a 5x8 font has 5 bytes per character).
+        # Optionally specify a points function that draws a whole array('h')
+        # of x, y pairs in one call, clipping them itself.
+        # Optionally specify a blit function that copies a Sprite onto the
+        # display, clipping it itself. Characters drawn in a single display
+        # colour are then rendered into GS2 glyphs and blitted, and strings
+        # drawn with cache=True are rendered into sprites, so drawing the same
+        # text again is one blit. Glyphs and strings share an LRU cache of up
+        # to cache_budget bytes.
+        # Optionally specify a fill_rect function that draws a filled
+        # rectangle, clipping it itself, for drawing scaled up text with.
+        # Optionally specify a face, such as a FontFile, to draw with instead
+        # of the built in 5x8 font.
         self._width = width
         self._height = height
         self._pixel = pixel
-        self._font_width, self._font_height = 5, 8
+        self._points = self._slow_points if points is None else points
+        self._blit = blit
+        self._fill_rect = self._slow_fill_rect if fill_rect is None else fill_rect
+        #: How many bytes of rendered glyphs and strings to keep at most, 0 turns the cache off
+        self.cache_budget = cache_budget
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._glyph = _Glyph()
+        self.face = face
+
+    @property
+    def face(self):
+        """
+        The font drawn with, a :class:`FontFile` or the built in 5x8 font. Set it to ``None`` to go back to the\
+        built in font.
+        """
+        return self._face
+
+    @face.setter
+    def face(self, face):
+        self._face = _BUILTIN if face is None else face
+        # Rendered glyphs keyed by (code << 2) | colour and rendered strings keyed by (text, colour, scale), each
+        # stored as (framebuffer or sprite, size in bytes), and the keys least recently used first
+        self._cache = {}
+        self._cache_order = []
+        self._cache_bytes = 0
+
+    @property
+    def area_width(self):
+        """
+        The width of the area drawn on in pixels
+        """
+        return self._width
+
+    @property
+    def area_height(self):
+        """
+        The height of the area drawn on in pixels
+        """
+        return self._height
 
-    def draw_char(self, ch, x, y, *args, **kwargs):
+    @property
+    def line_height(self):
+        """
+        The height of a line of text in pixels
+        """
+        return self._face.height
+
+    def _slow_points(self, coords, *args, **kwargs):
+        # Draw a batch of pixels one at a time, skipping any that are clipped.
+        for i in range(0, len(coords), 2):
+            x = coords[i]
+            y = coords[i + 1]
+            if 0 <= x < self._width and 0 <= y < self._height:
+                self._pixel(x, y, *args, **kwargs)
+
+    def _slow_fill_rect(self, x0, y0, width, height, *args, **kwargs):
+        # Draw a filled rectangle a pixel at a time, clipped to the drawing area.
+        for y in range(max(y0, 0), min(y0 + height, self._height)):
+            for x in range(max(x0, 0), min(x0 + width, self._width)):
+                self._pixel(x, y, *args, **kwargs)
+
+    def _fill_runs(self, code, x, y, scale, fill_rect, *args, **kwargs):
+        # Draw a character scaled up, as a rectangle for each run of set bits down each of its columns, so it takes
+        # as many calls as the character has runs however big it's drawn
+        face = self._face
+        for char_x in range(face.glyph_width(code)):
+            line = face.column(code, char_x)
+            char_y = 0
+            while line:
+                # Skip to the next set bit, then measure the run starting there
+                while not line & 0x1:
+                    line >>= 1
+                    char_y += 1
+                run = 0
+                while line & 0x1:
+                    line >>= 1
+                    run += 1
+                fill_rect(x + char_x * scale, y + char_y * scale, scale, run * scale, *args, **kwargs)
+                char_y += run
+
+    def _cached(self, key):
+        # Looks something up in the cache, making it the most recently used
+        entry = self._cache.get(key)
+        if entry is None:
+            self._stats['misses'] += 1
+            return None
+        self._stats['hits'] += 1
+        order = self._cache_order
+        if order[-1] != key:
+            order.remove(key)
+            order.append(key)
+        return entry[0]
+
+    def _make_room(self, size):
+        # Drops the least recently used glyphs and strings until there's room for another size bytes
+        while self._cache_order and self._cache_bytes + size > self.cache_budget:
+            self._cache_bytes -= self._cache.pop(self._cache_order.pop(0))[1]
+            self._stats['evictions'] += 1
+
+    def _cache_add(self, key, item, size):
+        self._make_room(size)
+        self._cache[key] = (item, size)
+        self._cache_order.append(key)
+        self._cache_bytes += size
+
+    def _glyph_fb(self, code, colour):
+        # The rendered glyph of a character, rendering it into its own GS2 framebuffer with everything but the set
+        # bits transparent when it isn't cached
+        key = (code << 2) | colour
+        glyph = self._cached(key)
+        if glyph is not None:
+            return glyph
+        face = self._face
+        glyph_width = face.glyph_width(code)
+        size = packed_size(glyph_width, face.height)
+        # Anything bigger than the whole budget is rendered for this once
+        if size <= self.cache_budget:
+            self._make_room(size)
+        glyph = FrameBuffer(bytearray(size), glyph_width, face.height, GS2_HMSB)
+        glyph.fill(TRANSPARENT)
+        for char_x in range(glyph_width):
+            line = face.column(code, char_x)
+            for char_y in range(face.height):
+                if (line >> char_y) & 0x1:
+                    glyph.pixel(char_x, char_y, colour)
+        if size <= self.cache_budget:
+            self._cache_add(key, glyph, size)
+        return glyph
+
+    def draw_char(self, ch, x, y, *args, scale=1, **kwargs):
         """
         Draws a single character at the specified location
 
         :param ch: The character to draw
         :param x: X location to draw at
         :param y: Y location to draw at
+        :param scale: How many pixels across and down to draw each pixel of the character as
         :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
         """
+        face = self._face
+        code = ord(ch)
+        glyph_width = face.glyph_width(code)
         # Don't draw the character if it will be clipped off the visible area.
-        if x < -self._font_width or x >= self._width or \
-                y < -self._font_height or y >= self._height:
+        if glyph_width == 0 or x < -glyph_width * scale or x >= self._width or \
+                y < -face.height * scale or y >= self._height:
             return
+        if scale > 1:
+            self._fill_runs(code, x, y, scale, self._fill_rect, *args, **kwargs)
+            return
+        # With a blit function and a cache, plain coloured characters are a single blit of the rendered glyph
+        if self._blit is not None and self.cache_budget and len(args) == 1 and not kwargs and \
+                args[0] in (WHITE, BLACK, RED):
+            glyph = self._glyph
+            glyph.fb = self._glyph_fb(code, args[0])
+            glyph.width = glyph_width
+            glyph.height = face.height
+            self._blit(glyph, x, y)
+            return
+        # Collect the pixels of the character and draw them in one go.
+        coords = array('h')
+        add = coords.append
         # Go through each column of the character.
-        for char_x in range(self._font_width):
-            # Grab the byte for the current column of font data.
-            line = _FONT[(ord(ch) * self._font_width) + char_x]
-            # Go through each row in the column byte.
-            for char_y in range(self._font_height):
-                # Draw a pixel for each bit that's flipped on.
+        for char_x in range(glyph_width):
+            # Grab the bits for the current column of font data.
+            line = face.column(code, char_x)
+            # Go through each row in the column.
+            for char_y in range(face.height):
+                # Add a pixel for each bit that's flipped on.
                 if (line >> char_y) & 0x1:
-                    self._pixel(x + char_x, y + char_y, *args, **kwargs)
+                    add(x + char_x)
+                    add(y + char_y)
+        self._points(coords, *args, **kwargs)
 
-    def text(self, text, x, y, *args, **kwargs):
+    def text(self, text, x, y, *args, scale=1, cache=False, **kwargs):
         """
         Draws text with the top-left corner of the text at the specified location
 
         :param text: The text to draw
         :param x: X location to draw at
         :param y: Y location to draw at
+        :param scale: How many pixels across and down to draw each pixel of the text as, for big text like names
+        :param cache: ``True`` to keep the whole string rendered, so drawing it again is a single blit. Worth it for\
+        labels that get redrawn unchanged, not for text that keeps changing such as counters or clocks, which would\
+        only push the labels out.
         :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
         """
+        face = self._face
+        if not text or x >= self._width or y >= self._height or y <= -face.height * scale or \
+                x + self.width(text, scale) <= 0:
+            return
+        # Strings to be cached in a plain colour are drawn from the cache as a single blit
+        if cache and self._blit is not None and self.cache_budget and len(args) == 1 and not kwargs and \
+                args[0] in (WHITE, BLACK, RED):
+            sprite = self._string(text, args[0], scale)
+            if sprite is not None:
+                self._blit(sprite, x, y)
+                return
         # Draw the specified text at the specified location.
-        for i in range(len(text)):
-            self.draw_char(text[i], x + (i * (self._font_width + 1)), y,
-                           *args, **kwargs)
+        for ch in text:
+            self.draw_char(ch, x, y, *args, scale=scale, **kwargs)
+            x += (face.glyph_width(ord(ch)) + 1) * scale
+
+    def _string(self, text, colour, scale):
+        # The rendered sprite of a string, None if it's too big to cache
+        key = (text, colour, scale)
+        sprite = self._cached(key)
+        if sprite is not None:
+            return sprite
+        face = self._face
+        # Leave off the gap after the last character
+        width = self.width(text, scale) - scale
+        height = face.height * scale
+        size = packed_size(width, height)
+        if width <= 0 or size > self.cache_budget:
+            return None
+        self._make_room(size)
+        sprite = Sprite(width, height, transparent=True)
+        sprite.fb.fill(TRANSPARENT)
+        x = 0
+        for ch in text:
+            code = ord(ch)
+            if scale > 1:
+                self._fill_runs(code, x, 0, scale, sprite.fb.fill_rect, colour)
+            elif face.glyph_width(code):
+                sprite.fb.blit(self._glyph_fb(code, colour), x, 0, TRANSPARENT)
+            x += (face.glyph_width(code) + 1) * scale
+        self._cache_add(key, sprite, size)
+        return sprite
+
+    @property
+    def cache_stats(self):
+        """
+        Rendered glyph and string cache counters: ``hits`` and ``misses`` count the glyphs and strings drawn from the\
+        cache or rendered, ``evictions`` how many were dropped to stay within :attr:`cache_budget` and ``bytes`` how\
+        much is cached.
+        """
+        self._stats['bytes'] = self._cache_bytes
+        return self._stats
 
-    def width(self, text):
+    def width(self, text, scale=1):
         """
         Calculates the width of a run of text
 
         :param text: The text to calculate the width for
+        :param scale: The scale the text is drawn at
         :return: The width of the run of text in pixels
         """
-        # Return the pixel width of the specified text message.
-        return len(text) * (self._font_width + 1)
+        # Each character takes its own width plus a pixel gap.
+        glyph_width = self._face.glyph_width
+        total = 0
+        for ch in text:
+            total += glyph_width(ord(ch)) + 1
+        return total * scale
@@ -1,9 +1,25 @@
+from micropython import const
+from array import array
+import math
+from fcb import _circles
+
+# Cohen-Sutherland region codes
+_LEFT = const(1)
+_RIGHT = const(2)
+_TOP = const(4)
+_BOTTOM = const(8)
+
+# How many circle quadrants bigger than the flash table to keep
+_QUADRANT_CACHE = const(4)
+
+
 class GFX:
     """
     A class for drawing simple graphics onto the display framebuffer.
     """
 
-    def __init__(self, width, height, pixel, hline=None, vline=None):
+    def __init__(self, width, height, pixel, hline=None, vline=None, fill_rect=None, fill=None,
+                 points=None, hspans=None, vspans=None, blit=None, rect=None):
         # Create an instance of the GFX drawing class.  You must pass in the
         # following parameters:
         #  - width = The width of the drawing area in pixels.
@@ -19,6 +35,27 @@ class GFX:
         #  - vline = A function to quickly draw a vertical line on the display.
         #            This should take at least an x, y, and height paraemter and
         #            any number of optional color or other parameters.
+        #  - fill_rect = A function to quickly draw a filled rectangle on the
+        #                display. This should take at least an x, y, width and
+        #                height parameter and any number of optional color or
+        #                other parameters.
+        #  - fill = A function to quickly fill the whole display. This should
+        #           take any number of optional color or other parameters.
+        #  - points = A function to draw a batch of pixels in one call. This
+        #             should take an array('h') of x, y pairs and any number of
+        #             optional color or other parameters, and clip the pixels
+        #             to the display itself.
+        #  - hspans = Like points, but taking x, y, width triples of
+        #             horizontal lines.
+        #  - vspans = Like points, but taking x, y, height triples of vertical
+        #             lines.
+        #  - blit = A function to copy a Sprite onto the display. This should
+        #           take the sprite and an x and y position, and clip the
+        #           sprite to the display itself.
+        #  - rect = A function to quickly draw a rectangle outline on the
+        #           display. This should take at least an x, y, width and
+        #           height parameter and any number of optional color or other
+        #           parameters, and clip the rectangle to the display itself.
         self.width = width
         self.height = height
         self._pixel = pixel
@@ -32,24 +69,102 @@ class GFX:
             self.vline = self._slow_vline
         else:
             self.vline = vline
+        self._fill_rect = fill_rect
+        self._fill = fill
+        self._rect = rect
+        self._points = self._slow_points if points is None else points
+        self._hspans = self._slow_hspans if hspans is None else hspans
+        self._vspans = self._slow_vspans if vspans is None else vspans
+        # Quadrants of circles too big for the flash table, most recently used last
+        self._quadrants = {}
+        self._quadrant_order = []
+        self._blit = self._slow_blit if blit is None else blit
 
     def _slow_hline(self, x0, y0, width, *args, **kwargs):
         # Slow implementation of a horizontal line using pixel drawing.
         # This is used as the default horizontal line if no faster override
         # is provided.
-        if y0 < 0 or y0 > self.height or x0 < -width or x0 > self.width:
+        if y0 < 0 or y0 >= self.height:
             return
-        for i in range(width):
-            self._pixel(x0+i, y0, *args, **kwargs)
+        for x in range(max(x0, 0), min(x0 + width, self.width)):
+            self._pixel(x, y0, *args, **kwargs)
 
     def _slow_vline(self, x0, y0, height, *args, **kwargs):
         # Slow implementation of a vertical line using pixel drawing.
         # This is used as the default vertical line if no faster override
         # is provided.
-        if y0 < -height or y0 > self.height or x0 < 0 or x0 > self.width:
+        if x0 < 0 or x0 >= self.width:
             return
-        for i in range(height):
-            self._pixel(x0, y0+i, *args, **kwargs)
+        for y in range(max(y0, 0), min(y0 + height, self.height)):
+            self._pixel(x0, y, *args, **kwargs)
+
+    def _hspan(self, x0, y0, width, *args, **kwargs):
+        # Clips a horizontal span to the drawing area before passing it on,
+        # so the line functions never see anything off screen.
+        if y0 < 0 or y0 >= self.height:
+            return
+        if x0 < 0:
+            width += x0
+            x0 = 0
+        if x0 + width > self.width:
+            width = self.width - x0
+        if width > 0:
+            self.hline(x0, y0, width, *args, **kwargs)
+
+    def _vspan(self, x0, y0, height, *args, **kwargs):
+        # Vertical version of _hspan.
+        if x0 < 0 or x0 >= self.width:
+            return
+        if y0 < 0:
+            height += y0
+            y0 = 0
+        if y0 + height > self.height:
+            height = self.height - y0
+        if height > 0:
+            self.vline(x0, y0, height, *args, **kwargs)
+
+    def _slow_points(self, coords, *args, **kwargs):
+        # Slow implementation of batched pixels using pixel drawing, used if
+        # no faster override is provided.
+        for i in range(0, len(coords), 2):
+            x = coords[i]
+            y = coords[i + 1]
+            if 0 <= x < self.width and 0 <= y < self.height:
+                self._pixel(x, y, *args, **kwargs)
+
+    def _slow_hspans(self, spans, *args, **kwargs):
+        # Slow implementation of batched horizontal lines using hline.
+        for i in range(0, len(spans), 3):
+            self._hspan(spans[i], spans[i + 1], spans[i + 2], *args, **kwargs)
+
+    def _slow_vspans(self, spans, *args, **kwargs):
+        # Slow implementation of batched vertical lines using vline.
+        for i in range(0, len(spans), 3):
+            self._vspan(spans[i], spans[i + 1], spans[i + 2], *args, **kwargs)
+
+    def _slow_blit(self, sprite, x0, y0):
+        # Slow implementation of blit using pixel drawing, passing the value of
+        # each pixel of the sprite on as its colour.
+        fb = sprite.fb
+        key = sprite.key
+        for y in range(max(-y0, 0), min(sprite.height, self.height - y0)):
+            for x in range(max(-x0, 0), min(sprite.width, self.width - x0)):
+                c = fb.pixel(x, y)
+                if c != key:
+                    self._pixel(x0 + x, y0 + y, c)
+
+    def _outcode(self, x, y):
+        # Cohen-Sutherland region code of a point, 0 when it's on screen.
+        code = 0
+        if x < 0:
+            code |= _LEFT
+        elif x >= self.width:
+            code |= _RIGHT
+        if y < 0:
+            code |= _TOP
+        elif y >= self.height:
+            code |= _BOTTOM
+        return code
 
     def rect(self, x0, y0, width, height, *args, **kwargs):
         """
@@ -64,12 +179,15 @@ class GFX:
         :param width: The width of the rectangle to draw
         :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
         """
-        if y0 < -height or y0 > self.height or x0 < -width or x0 > self.width:
+        if y0 <= -height or y0 >= self.height or x0 <= -width or x0 >= self.width:
             return
-        self.hline(x0, y0, width, *args, **kwargs)
-        self.hline(x0, y0+height-1, width, *args, **kwargs)
-        self.vline(x0, y0, height, *args, **kwargs)
-        self.vline(x0+width-1, y0, height, *args, **kwargs)
+        if self._rect is not None and width > 0 and height > 0:
+            self._rect(x0, y0, width, height, *args, **kwargs)
+            return
+        self._hspan(x0, y0, width, *args, **kwargs)
+        self._hspan(x0, y0+height-1, width, *args, **kwargs)
+        self._vspan(x0, y0, height, *args, **kwargs)
+        self._vspan(x0+width-1, y0, height, *args, **kwargs)
 
     def fill_rect(self, x0, y0, width, height, *args, **kwargs):
         """
@@ -83,10 +201,38 @@ class GFX:
         :param width: The width of the rectangle to draw
         :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
         """
-        if y0 < -height or y0 > self.height or x0 < -width or x0 > self.width:
+        if x0 < 0:
+            width += x0
+            x0 = 0
+        if y0 < 0:
+            height += y0
+            y0 = 0
+        width = min(width, self.width - x0)
+        height = min(height, self.height - y0)
+        if width <= 0 or height <= 0:
             return
-        for i in range(x0, x0+width):
-            self.vline(i, y0, height, *args, **kwargs)
+        if self._fill is not None and width == self.width and height == self.height:
+            self._fill(*args, **kwargs)
+        elif self._fill_rect is not None:
+            self._fill_rect(x0, y0, width, height, *args, **kwargs)
+        else:
+            for i in range(x0, x0+width):
+                self.vline(i, y0, height, *args, **kwargs)
+
+    def blit(self, sprite, x0, y0):
+        """
+        Image drawing function.
+
+        Will copy a :class:`Sprite <fcb._sprite.Sprite>` onto the display with its top left corner at x0, y0. The\
+        pixels of the sprite carry their own colours, and transparent pixels are left untouched.
+
+        :param sprite: The sprite to draw
+        :param x0: X component of the location of the top left corner of the sprite
+        :param y0: Y component of the location of the top left corner of the sprite
+        """
+        if x0 <= -sprite.width or x0 >= self.width or y0 <= -sprite.height or y0 >= self.height:
+            return
+        self._blit(sprite, x0, y0)
 
     def line(self, x0, y0, x1, y1, *args, **kwargs):
         """
@@ -99,6 +245,11 @@ class GFX:
         :param x1: X component of the location of the end of the line
         :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
         """
+        # Cohen-Sutherland trivial reject, lines with both ends on screen need no clipping at all
+        code0 = self._outcode(x0, y0)
+        code1 = self._outcode(x1, y1)
+        if code0 & code1:
+            return
         steep = abs(y1 - y0) > abs(x1 - x0)
         if steep:
             x0, y0 = y0, x0
@@ -114,16 +265,47 @@ class GFX:
             ystep = 1
         else:
             ystep = -1
+        if code0 | code1:
+            # Work out the first and last steps that land on screen and jump straight to the first one, keeping the
+            # exact pixels the unclipped line would have drawn.
+            major, minor = (self.height, self.width) if steep else (self.width, self.height)
+            first = max(0, -x0)
+            last = min(dx, major - 1 - x0)
+            # Limits on how many minor axis steps may have been taken
+            if ystep > 0:
+                steps_min, steps_max = max(0, -y0), minor - 1 - y0
+            else:
+                steps_min, steps_max = max(0, y0 - minor + 1), y0
+            if steps_max < steps_min:
+                return
+            if dy:
+                if steps_min > 0:
+                    first = max(first, ((steps_min - 1) * dx + err) // dy + 1)
+                last = min(last, (steps_max * dx + err) // dy)
+            elif steps_min > 0:
+                return
+            if first > last:
+                return
+            steps = max(0, -((err - first * dy) // dx))
+            err += steps * dx - first * dy
+            y0 += steps * ystep
+            x0 += first
+            x1 = x0 + last - first
+        coords = array('h')
+        add = coords.append
         while x0 <= x1:
             if steep:
-                self._pixel(y0, x0, *args, **kwargs)
+                add(y0)
+                add(x0)
             else:
-                self._pixel(x0, y0, *args, **kwargs)
+                add(x0)
+                add(y0)
             err -= dy
             if err < 0:
                 y0 += ystep
                 err += dx
             x0 += 1
+        self._points(coords, *args, **kwargs)
 
     def circle(self, x0, y0, radius, *args, **kwargs):
         """
@@ -136,31 +318,25 @@ class GFX:
         :param radius: The radius of the circle to draw
         :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
         """
-        f = 1 - radius
-        ddF_x = 1
-        ddF_y = -2 * radius
-        x = 0
-        y = radius
-        self._pixel(x0, y0 + radius, *args, **kwargs)
-        self._pixel(x0, y0 - radius, *args, **kwargs)
-        self._pixel(x0 + radius, y0, *args, **kwargs)
-        self._pixel(x0 - radius, y0, *args, **kwargs)
-        while x < y:
-            if f >= 0:
-                y -= 1
-                ddF_y += 2
-                f += ddF_y
-            x += 1
-            ddF_x += 2
-            f += ddF_x
-            self._pixel(x0 + x, y0 + y, *args, **kwargs)
-            self._pixel(x0 - x, y0 + y, *args, **kwargs)
-            self._pixel(x0 + x, y0 - y, *args, **kwargs)
-            self._pixel(x0 - x, y0 - y, *args, **kwargs)
-            self._pixel(x0 + y, y0 + x, *args, **kwargs)
-            self._pixel(x0 - y, y0 + x, *args, **kwargs)
-            self._pixel(x0 + y, y0 - x, *args, **kwargs)
-            self._pixel(x0 - y, y0 - x, *args, **kwargs)
+        if x0 + radius < 0 or x0 - radius >= self.width or y0 + radius < 0 or y0 - radius >= self.height:
+            return
+        # Walk the rows of the quadrant, each row of the outline runs from just past the row below's half width out
+        # to its own. Off screen spans are left to the hspans function to clip.
+        ext = self._quadrant(radius)
+        top = ext[radius]
+        spans = array('h', (x0 - top, y0 - radius, 2*top + 1, x0 - top, y0 + radius, 2*top + 1))
+        add = spans.append
+        for dy in range(radius):
+            outer = ext[dy]
+            inner = min(ext[dy + 1] + 1, outer)
+            for y in ((y0 - dy, y0 + dy) if dy else (y0,)):
+                add(x0 - outer)
+                add(y)
+                add(outer - inner + 1)
+                add(x0 + inner)
+                add(y)
+                add(outer - inner + 1)
+        self._hspans(spans, *args, **kwargs)
 
     def fill_circle(self, x0, y0, radius, *args, **kwargs):
         """
@@ -173,24 +349,18 @@ class GFX:
         :param radius: The radius of the circle to draw
         :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
         """
-        self.vline(x0, y0 - radius, 2*radius + 1, *args, **kwargs)
-        f = 1 - radius
-        ddF_x = 1
-        ddF_y = -2 * radius
-        x = 0
-        y = radius
-        while x < y:
-            if f >= 0:
-                y -= 1
-                ddF_y += 2
-                f += ddF_y
-            x += 1
-            ddF_x += 2
-            f += ddF_x
-            self.vline(x0 + x, y0 - y, 2*y + 1, *args, **kwargs)
-            self.vline(x0 + y, y0 - x, 2*x + 1, *args, **kwargs)
-            self.vline(x0 - x, y0 - y, 2*y + 1, *args, **kwargs)
-            self.vline(x0 - y, y0 - x, 2*x + 1, *args, **kwargs)
+        if x0 + radius < 0 or x0 - radius >= self.width or y0 + radius < 0 or y0 - radius >= self.height:
+            return
+        # One span per row, off screen spans are left to the hspans function to clip
+        ext = self._quadrant(radius)
+        spans = array('h')
+        add = spans.append
+        for y in range(max(-radius, -y0), min(radius, self.height - 1 - y0) + 1):
+            half = ext[y if y >= 0 else -y]
+            add(x0 - half)
+            add(y0 + y)
+            add(2*half + 1)
+        self._hspans(spans, *args, **kwargs)
 
     def triangle(self, x0, y0, x1, y1, x2, y2, *args, **kwargs):
         """
@@ -236,6 +406,8 @@ class GFX:
         if y0 > y1:
             y0, y1 = y1, y0
             x0, x1 = x1, x0
+        if y2 < 0 or y0 >= self.height or max(x0, x1, x2) < 0 or min(x0, x1, x2) >= self.width:
+            return
         a = 0
         b = 0
         y = 0
@@ -251,8 +423,13 @@ class GFX:
                 a = x2
             elif x2 > b:
                 b = x2
-            self.hline(a, y0, b-a+1, *args, **kwargs)
+            self._hspan(a, y0, b-a+1, *args, **kwargs)
             return
+        # Spans are clipped as they're added so they always fit in the array
+        spans = array('h')
+        add = spans.append
+        width = self.width
+        height = self.height
         dx01 = x1 - x0
         dy01 = y1 - y0
         dx02 = x2 - x0
@@ -278,7 +455,12 @@ class GFX:
             sb += dx02
             if a > b:
                 a, b = b, a
-            self.hline(a, y, b-a+1, *args, **kwargs)
+            if 0 <= y < height:
+                add(max(a, 0))
+                add(y)
+                add(min(b, width - 1) - max(a, 0) + 1)
+        # Carry on from the row after the first half, a for loop leaves y on its last value rather than past it
+        y = last + 1
         sa = dx12 * (y - y1)
         sb = dx02 * (y - y0)
         while y <= y2:
@@ -288,5 +470,233 @@ class GFX:
             sb += dx02
             if a > b:
                 a, b = b, a
-            self.hline(a, y, b-a+1, *args, **kwargs)
+            if 0 <= y < height:
+                add(max(a, 0))
+                add(y)
+                add(min(b, width - 1) - max(a, 0) + 1)
             y += 1
+        self._hspans(spans, *args, **kwargs)
+
+    def polygon(self, vertices, *args, **kwargs):
+        """
+        Polygon drawing function.
+
+        Will draw a single pixel wide outline joining the vertices in order, and the last one back to the first.
+
+        :param vertices: A sequence of (x, y) pairs, the corners of the polygon
+        :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
+        """
+        for i in range(len(vertices)):
+            x0, y0 = vertices[i - 1]
+            x1, y1 = vertices[i]
+            self.line(x0, y0, x1, y1, *args, **kwargs)
+
+    def fill_polygon(self, vertices, *args, **kwargs):
+        """
+        Filled polygon drawing function.
+
+        Will fill the polygon with corners at the given vertices, which can be convex or concave. Where the outline\
+        crosses itself, areas enclosed an odd number of times are filled. Pixels along the right and bottom edges are\
+        left out, so polygons sharing an edge don't overlap.
+
+        :param vertices: A sequence of (x, y) pairs, the corners of the polygon in order
+        :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
+        """
+        # Edge table of (top y, bottom y, x at the top, dx, dy), horizontal edges don't cross any scanline
+        edges = []
+        min_x = max_x = vertices[0][0]
+        for i in range(len(vertices)):
+            xa, ya = vertices[i - 1]
+            xb, yb = vertices[i]
+            min_x = min(min_x, xb)
+            max_x = max(max_x, xb)
+            if ya == yb:
+                continue
+            if ya > yb:
+                xa, ya, xb, yb = xb, yb, xa, ya
+            edges.append((ya, yb, xa, xb - xa, yb - ya))
+        if not edges or max_x < 0 or min_x >= self.width:
+            return
+        edges.sort(key=lambda e: e[0])
+        width = self.width
+        spans = array('h')
+        add = spans.append
+        active = []
+        n = 0
+        for y in range(max(edges[0][0], 0), min(max(e[1] for e in edges), self.height)):
+            # Edges become active at their top row and are dropped on their bottom one
+            while n < len(edges) and edges[n][0] <= y:
+                active.append(edges[n])
+                n += 1
+            i = 0
+            while i < len(active):
+                if active[i][1] <= y:
+                    active.pop(i)
+                else:
+                    i += 1
+            xs = sorted([e[2] + (y - e[0]) * e[3] // e[4] for e in active])
+            # Fill between each pair of crossings, one span per pair
+            for i in range(0, len(xs) - 1, 2):
+                a = max(xs[i], 0)
+                b = min(xs[i + 1], width)
+                if a < b:
+                    add(a)
+                    add(y)
+                    add(b - a)
+        self._hspans(spans, *args, **kwargs)
+
+    def thick_line(self, x0, y0, x1, y1, thickness, *args, **kwargs):
+        """
+        Thick line drawing function.
+
+        Will draw a line of the given thickness centred on the line from x0, y0 to x1, y1, with flat ends.
+
+        :param x0: X component of the location of the start of the line
+        :param y0: Y component of the location of the start of the line
+        :param x1: X component of the location of the end of the line
+        :param y1: Y component of the location of the end of the line
+        :param thickness: The thickness of the line in pixels
+        :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
+        """
+        if thickness <= 1:
+            self.line(x0, y0, x1, y1, *args, **kwargs)
+            return
+        dx = x1 - x0
+        dy = y1 - y0
+        length = math.sqrt(dx * dx + dy * dy)
+        if length == 0:
+            self.fill_rect(x0 - thickness // 2, y0 - thickness // 2, thickness, thickness, *args, **kwargs)
+            return
+        # Offset from the centre line to either side
+        ox = -dy * thickness / (2 * length)
+        oy = dx * thickness / (2 * length)
+        self.fill_polygon(((round(x0 + ox), round(y0 + oy)), (round(x1 + ox), round(y1 + oy)),
+                           (round(x1 - ox), round(y1 - oy)), (round(x0 - ox), round(y0 - oy))), *args, **kwargs)
+
+    def _quadrant(self, radius):
+        # Half width of each row of a circle, indexed by the distance of the row from the centre. Small radii come
+        # straight out of the table in flash, bigger ones are traced with the midpoint algorithm and the last few are
+        # kept around.
+        if radius <= _circles.MAX_RADIUS:
+            start = radius * (radius + 1) // 2
+            return memoryview(_circles.TABLE)[start:start + radius + 1]
+        ext = self._quadrants.get(radius)
+        order = self._quadrant_order
+        if ext is not None:
+            order.remove(radius)
+            order.append(radius)
+            return ext
+        if len(order) >= _QUADRANT_CACHE:
+            del self._quadrants[order.pop(0)]
+        ext = array('h', bytes(2 * (radius + 1)))
+        ext[0] = radius
+        f = 1 - radius
+        ddF_x = 1
+        ddF_y = -2 * radius
+        x = 0
+        y = radius
+        while x < y:
+            if f >= 0:
+                y -= 1
+                ddF_y += 2
+                f += ddF_y
+            x += 1
+            ddF_x += 2
+            f += ddF_x
+            if ext[y] < x:
+                ext[y] = x
+            if ext[x] < y:
+                ext[x] = y
+        self._quadrants[radius] = ext
+        order.append(radius)
+        return ext
+
+    def round_rect(self, x0, y0, width, height, radius, *args, **kwargs):
+        """
+        Rounded rectangle drawing function.
+
+        Will draw a single pixel wide non filled rectangle with rounded corners starting in the upper left x0, y0\
+        position and width, height pixels in size.
+
+        :param x0: X component of the location of the top left corner of the rectangle
+        :param y0: Y component of the location of the top left corner of the rectangle
+        :param width: The width of the rectangle to draw
+        :param height: The height of the rectangle to draw
+        :param radius: The radius of the corners, limited to what fits in the rectangle
+        :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
+        """
+        radius = min(radius, (min(width, height) - 1) // 2)
+        if radius <= 0:
+            self.rect(x0, y0, width, height, *args, **kwargs)
+            return
+        if y0 <= -height or y0 >= self.height or x0 <= -width or x0 >= self.width:
+            return
+        self._hspan(x0 + radius, y0, width - 2*radius, *args, **kwargs)
+        self._hspan(x0 + radius, y0 + height - 1, width - 2*radius, *args, **kwargs)
+        self._vspan(x0, y0 + radius, height - 2*radius, *args, **kwargs)
+        self._vspan(x0 + width - 1, y0 + radius, height - 2*radius, *args, **kwargs)
+        # Centres of the corner arcs
+        left = x0 + radius
+        right = x0 + width - 1 - radius
+        top = y0 + radius
+        bottom = y0 + height - 1 - radius
+        coords = array('h')
+        add = coords.append
+        f = 1 - radius
+        ddF_x = 1
+        ddF_y = -2 * radius
+        x = 0
+        y = radius
+        while x < y:
+            if f >= 0:
+                y -= 1
+                ddF_y += 2
+                f += ddF_y
+            x += 1
+            ddF_x += 2
+            f += ddF_x
+            for dx, dy in ((x, y), (y, x)):
+                for px, py in ((right + dx, bottom + dy), (left - dx, bottom + dy),
+                               (right + dx, top - dy), (left - dx, top - dy)):
+                    add(px)
+                    add(py)
+        self._points(coords, *args, **kwargs)
+
+    def fill_round_rect(self, x0, y0, width, height, radius, *args, **kwargs):
+        """
+        Filled rounded rectangle drawing function.
+
+        Will draw a filled rectangle with rounded corners starting in the upper left x0, y0 position and width,\
+        height pixels in size.
+
+        :param x0: X component of the location of the top left corner of the rectangle
+        :param y0: Y component of the location of the top left corner of the rectangle
+        :param width: The width of the rectangle to draw
+        :param height: The height of the rectangle to draw
+        :param radius: The radius of the corners, limited to what fits in the rectangle
+        :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
+        """
+        radius = min(radius, (min(width, height) - 1) // 2)
+        if radius <= 0:
+            self.fill_rect(x0, y0, width, height, *args, **kwargs)
+            return
+        if y0 <= -height or y0 >= self.height or x0 <= -width or x0 >= self.width:
+            return
+        ext = self._quadrant(radius)
+        spans = array('h')
+        add = spans.append
+        for i in range(max(-y0, 0), min(height, self.height - y0)):
+            # How far the row is pulled in by the corners
+            if i < radius:
+                inset = radius - ext[radius - i]
+            elif i >= height - radius:
+                inset = radius - ext[i - (height - 1 - radius)]
+            else:
+                inset = 0
+            a = max(x0 + inset, 0)
+            b = min(x0 + width - inset, self.width)
+            if a < b:
+                add(a)
+                add(y0 + i)
+                add(b - a)
+        self._hspans(spans, *args, **kwargs)
@@ -0,0 +1,158 @@
+_ELLIPSIS = '...'
+
+
+class TextBox:
+    """
+    Lays paragraphs of text out in a box with a :class:`Font <fcb._font.Font>`, wrapping them a word at a time and\
+    ending the last line with an ellipsis when there's more text than fits.
+
+    Working out where the lines break takes measuring every word, so the lines of the most recently laid out texts\
+    are kept. Redrawing a paragraph that hasn't changed goes straight to drawing its lines.
+
+    :param font: The font to draw with
+    :param cache_size: How many laid out texts to keep, 0 turns the cache off
+    """
+
+    def __init__(self, font, cache_size=8):
+        self._font = font
+        #: How many laid out texts to keep, 0 turns the cache off
+        self.cache_size = cache_size
+        # Lines keyed by (text, width, scale), the keys least recently used first, and the face they were measured in
+        self._lines = {}
+        self._order = []
+        self._face = font.face
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def wrap(self, text, width, scale=1):
+        """
+        Breaks text into lines that fit a width. Lines break between words and at newlines, words too long for a\
+        line of their own are broken wherever they run out of room.
+
+        :param text: The text to break into lines
+        :param width: The width of the lines in pixels
+        :param scale: The scale the text is drawn at
+        :return: A tuple of the lines
+        """
+        # Changing the font face changes every measurement
+        if self._font.face is not self._face:
+            self._face = self._font.face
+            self._lines = {}
+            self._order = []
+        key = (text, width, scale)
+        lines = self._lines.get(key)
+        if lines is not None:
+            self._stats['hits'] += 1
+            if self._order[-1] != key:
+                self._order.remove(key)
+                self._order.append(key)
+            return lines
+        self._stats['misses'] += 1
+        lines = self._break(text, width, scale)
+        if self.cache_size:
+            while len(self._order) >= self.cache_size:
+                del self._lines[self._order.pop(0)]
+                self._stats['evictions'] += 1
+            self._lines[key] = lines
+            self._order.append(key)
+        return lines
+
+    def _break(self, text, width, scale):
+        font = self._font
+        # Measurements include the gap after the last character, which can hang off the end of a line
+        limit = width + scale
+        space = font.width(' ', scale)
+        lines = []
+        for paragraph in text.split('\n'):
+            line = ''
+            line_width = 0
+            for word in paragraph.split():
+                word_width = font.width(word, scale)
+                if line and line_width + space + word_width <= limit:
+                    line += ' ' + word
+                    line_width += space + word_width
+                    continue
+                if line:
+                    lines.append(line)
+                while len(word) > 1 and word_width > limit:
+                    # Take as many characters as fit, but always at least one
+                    taken = 0
+                    taken_width = 0
+                    for ch in word:
+                        ch_width = font.width(ch, scale)
+                        if taken and taken_width + ch_width > limit:
+                            break
+                        taken += 1
+                        taken_width += ch_width
+                    lines.append(word[:taken])
+                    word = word[taken:]
+                    word_width -= taken_width
+                line = word
+                line_width = word_width
+            lines.append(line)
+        return tuple(lines)
+
+    def _ellipsize(self, line, width, scale):
+        # Shortens a line until it fits with an ellipsis on the end
+        font = self._font
+        limit = width + scale - font.width(_ELLIPSIS, scale)
+        line_width = font.width(line, scale)
+        while line and line_width > limit:
+            line_width -= font.width(line[-1], scale)
+            line = line[:-1]
+        return line.rstrip() + _ELLIPSIS
+
+    def measure(self, text, width, scale=1, spacing=1):
+        """
+        Calculates the height text takes up once it's wrapped to a width
+
+        :param text: The text to measure
+        :param width: The width of the lines in pixels
+        :param scale: The scale the text is drawn at
+        :param spacing: The gap between lines in pixels, before scaling
+        :return: The height of the wrapped text in pixels
+        """
+        lines = len(self.wrap(text, width, scale))
+        return lines * (self._font.line_height + spacing) * scale - spacing * scale
+
+    def draw(self, text, x, y, width, height, *args, scale=1, spacing=1, cache=False, **kwargs):
+        """
+        Draws text wrapped into a box. Lines that don't fit in the box aren't drawn, and if any are left out the last\
+        line drawn ends with an ellipsis.
+
+        :param text: The text to draw
+        :param x: X location of the top left corner of the box
+        :param y: Y location of the top left corner of the box
+        :param width: The width of the box in pixels
+        :param height: The height of the box in pixels
+        :param scale: How many pixels across and down to draw each pixel of the text as
+        :param spacing: The gap between lines in pixels, before scaling
+        :param cache: ``True`` to keep the lines rendered, see :meth:`Font.text <fcb._font.Font.text>`
+        :Additional arguments: Passed to the pixel drawing function of the framebuffer, for example to set the colour
+        :return: The number of lines that fit in the box
+        """
+        font = self._font
+        lines = self.wrap(text, width, scale)
+        line_height = font.line_height * scale
+        pitch = line_height + spacing * scale
+        count = min(len(lines), (height + spacing * scale) // pitch)
+        # A box off the drawing area still reports its lines, there's just nothing to draw
+        if x >= font.area_width or x + width <= 0:
+            return count
+        # Whole lines off the drawing area are skipped without looking at their characters
+        for i in range(max(0, (-y - line_height) // pitch + 1), count):
+            line_y = y + i * pitch
+            if line_y >= font.area_height:
+                break
+            line = lines[i]
+            if i == count - 1 and count < len(lines):
+                line = self._ellipsize(line, width, scale)
+            font.text(line, x, line_y, *args, scale=scale, cache=cache, **kwargs)
+        return count
+
+    @property
+    def cache_stats(self):
+        """
+        Line break cache counters: ``hits`` and ``misses`` count the texts laid out from the cache or measured, and\
+        ``evictions`` how many were dropped to stay within :attr:`cache_size`.
+        """
+        return self._stats
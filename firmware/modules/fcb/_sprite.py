@@ -0,0 +1,84 @@
+from micropython import const
+import struct
+from framebuf import FrameBuffer, GS2_HMSB, MONO_HLSB
+
+# Pixel value skipped when blitting a transparent GS2 sprite, the one value the display doesn't use
+TRANSPARENT = const(3)
+
+# Sprite file header: magic, width, height, flags. The packed pixel data follows straight after.
+_MAGIC = b'FS'
+_HEADER = '<2sHHB'
+_HEADER_SIZE = const(7)
+_FLAG_MONO = const(1)
+_FLAG_TRANSPARENT = const(2)
+
+
+def packed_size(width, height, mono=False):
+    """
+    Calculates the number of bytes of packed pixel data a sprite needs
+
+    :param width: The width of the sprite in pixels
+    :param height: The height of the sprite in pixels
+    :param mono: ``True`` for a 1-bpp sprite, ``False`` for a 2-bpp one
+    :return: The size of the pixel data in bytes
+    """
+    # Both formats pad every row to a whole byte
+    if mono:
+        return ((width + 7) >> 3) * height
+    return ((width + 3) >> 2) * height
+
+
+class Sprite:
+    """
+    An image packed ready to be copied onto the display with :meth:`GFX.blit <fcb._gfx.GFX.blit>`.
+
+    Colour sprites use the same 2-bpp ``GS2_HMSB`` layout as the display framebuffer, so each pixel holds ``WHITE``,\
+    ``BLACK``, ``RED`` or, for transparent sprites, :data:`TRANSPARENT`. Mono sprites use the 1-bpp ``MONO_HLSB``\
+    layout at a quarter of the size, set bits are drawn black and, for transparent sprites, clear bits are skipped\
+    instead of drawn white.
+
+    Use ``mksprite.py`` from the firmware directory to convert PNG and BMP files into sprite files for :meth:`load`.
+
+    :param width: The width of the sprite in pixels
+    :param height: The height of the sprite in pixels
+    :param data: The packed pixel data, or ``None`` to start with a blank sprite
+    :param mono: ``True`` if the data is 1-bpp
+    :param transparent: ``True`` if the sprite has transparent pixels that should be skipped when drawing
+    """
+
+    def __init__(self, width, height, data=None, mono=False, transparent=False):
+        size = packed_size(width, height, mono)
+        if data is None:
+            data = bytearray(size)
+        elif len(data) < size:
+            raise ValueError("Sprite data too short")
+        self.width = width
+        self.height = height
+        self.data = data
+        self.mono = mono
+        # Colour key for FrameBuffer.blit, -1 means every pixel is drawn
+        if not transparent:
+            self.key = -1
+        elif mono:
+            self.key = 0
+        else:
+            self.key = TRANSPARENT
+        self.fb = FrameBuffer(data, width, height, MONO_HLSB if mono else GS2_HMSB)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a sprite file created by ``mksprite.py``
+
+        :param path: The path of the file to load
+        :return: A new :class:`Sprite`
+        """
+        with open(path, 'rb') as f:
+            magic, width, height, flags = struct.unpack(_HEADER, f.read(_HEADER_SIZE))
+            if magic != _MAGIC:
+                raise ValueError("Not a sprite file")
+            mono = bool(flags & _FLAG_MONO)
+            data = bytearray(packed_size(width, height, mono))
+            if f.readinto(data) != len(data):
+                raise ValueError("Sprite file truncated")
+        return cls(width, height, data, mono, bool(flags & _FLAG_TRANSPARENT))
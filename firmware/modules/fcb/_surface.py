@@ -0,0 +1,144 @@
+from micropython import const
+from framebuf import FrameBuffer, GS2_HMSB
+from framegen import draw_points, draw_hspans, draw_vspans
+
+WHITE = const(0)
+BLACK = const(1)
+RED = const(2)
+
+
+def _grow(rect, x0, y0, x1, y1):
+    # Grows an inclusive [x0, y0, x1, y1] box in place to cover another one, starting it if there is none yet
+    if rect is None:
+        return [x0, y0, x1, y1]
+    rect[0] = min(rect[0], x0)
+    rect[1] = min(rect[1], y0)
+    rect[2] = max(rect[2], x1)
+    rect[3] = max(rect[3], y1)
+    return rect
+
+
+class Surface:
+    """
+    A GS2 framebuffer with the drawing functions :class:`GFX <fcb._gfx.GFX>` and :class:`Font <fcb._font.Font>`\
+    use as their backend, which keeps track of the area drawn on since it was last shown.
+
+    :param width: The width of the surface in pixels, a multiple of 4 so rows are whole bytes
+    :param height: The height of the surface in pixels
+    """
+
+    # Checked once per drawing call, anything else is ignored
+    _colours = frozenset((WHITE, BLACK, RED))
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._buf_data = bytearray(width * height // 4)
+        self.buf = FrameBuffer(self._buf_data, width, height, GS2_HMSB)
+        self._dirty = False
+        # Bounding box (x0, y0, x1, y1) of everything drawn since it was last shown, inclusive
+        self._dirty_rect = None
+        # Called before drawing while a compositor's layers are on the surface, to take them off first
+        self._uncover = None
+
+    def _mark(self, x0, y0, x1, y1):
+        # Grows the dirty bounding box to cover the inclusive rectangle, clipped to the surface
+        x0 = max(x0, 0)
+        y0 = max(y0, 0)
+        x1 = min(x1, self.width - 1)
+        y1 = min(y1, self.height - 1)
+        if x0 > x1 or y0 > y1:
+            return
+        self._dirty_rect = _grow(self._dirty_rect, x0, y0, x1, y1)
+        self._dirty = True
+
+    def set_pixel(self, x, y, v):
+        if v in self._colours:
+            if self._uncover is not None:
+                self._uncover()
+            self.buf.pixel(x, y, v)
+            self._mark(x, y, x, y)
+
+    def hline(self, x, y, w, v):
+        if v in self._colours:
+            if self._uncover is not None:
+                self._uncover()
+            self.buf.hline(x, y, w, v)
+            self._mark(x, y, x + w - 1, y)
+
+    def vline(self, x, y, h, v):
+        if v in self._colours:
+            if self._uncover is not None:
+                self._uncover()
+            self.buf.vline(x, y, h, v)
+            self._mark(x, y, x, y + h - 1)
+
+    def fill_rect(self, x, y, w, h, v):
+        if v in self._colours:
+            if self._uncover is not None:
+                self._uncover()
+            self.buf.fill_rect(x, y, w, h, v)
+            self._mark(x, y, x + w - 1, y + h - 1)
+
+    def rect(self, x, y, w, h, v):
+        if v in self._colours:
+            if self._uncover is not None:
+                self._uncover()
+            self.buf.rect(x, y, w, h, v)
+            self._mark(x, y, x + w - 1, y + h - 1)
+
+    def points(self, coords, v):
+        if v in self._colours:
+            if self._uncover is not None:
+                self._uncover()
+            box = draw_points(self._buf_data, self.width, self.height, coords, v)
+            if box is not None:
+                self._mark(*box)
+
+    def hspans(self, spans, v):
+        if v in self._colours:
+            if self._uncover is not None:
+                self._uncover()
+            box = draw_hspans(self._buf_data, self.width, self.height, spans, v)
+            if box is not None:
+                self._mark(*box)
+
+    def vspans(self, spans, v):
+        if v in self._colours:
+            if self._uncover is not None:
+                self._uncover()
+            box = draw_vspans(self._buf_data, self.width, self.height, spans, v)
+            if box is not None:
+                self._mark(*box)
+
+    def blit(self, sprite, x, y):
+        if self._uncover is not None:
+            self._uncover()
+        self.buf.blit(sprite.fb, x, y, sprite.key)
+        self._mark(x, y, x + sprite.width - 1, y + sprite.height - 1)
+
+    def fill(self, v):
+        if v in self._colours:
+            if self._uncover is not None:
+                self._uncover()
+            # Every pixel of a GS2 byte gets the same value, so set one byte and keep doubling the filled part
+            data = memoryview(self._buf_data)
+            data[0] = v * 0b01010101
+            size = len(data)
+            filled = 1
+            while filled < size:
+                n = min(filled, size - filled)
+                data[filled:filled + n] = data[:n]
+                filled += n
+            self._mark(0, 0, self.width - 1, self.height - 1)
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    def _take_dirty(self):
+        # Returns the dirty bounding box and starts tracking afresh
+        rect = self._dirty_rect
+        self._dirty = False
+        self._dirty_rect = None
+        return rect
@@ -8,9 +8,13 @@ from fcb._adt import ADT75
 from fcb._epd import EPD, RESOLUTION
 from fcb._gfx import GFX
 from fcb._font import Font
+from fcb._layout import TextBox
+from fcb._assets import Assets
+from fcb._canvas import Canvas, Compositor
 
 DISP_RESOLUTION = RESOLUTION[0]
 _HOME_APP = "fcb.default_apps.circle_test"
+_STATUS_HEIGHT = const(10)
 
 class Event:
     """
@@ -63,8 +67,15 @@ class FCB:
         self._adt = ADT75(i2c=self._i2c)
         self._epd = EPD(spi=EPSPI(), cs_pin=Pin(15, Pin.OUT), reset_pin=Pin(0, Pin.OUT), busy_pin=Pin(16, Pin.IN),
                         adt=self._adt)
-        self._gfx = GFX(RESOLUTION[0][0], RESOLUTION[0][1], self._epd.set_pixel, self._epd.hline, self._epd.vline)
-        self._font = Font(RESOLUTION[0][0], RESOLUTION[0][1], self._epd.set_pixel)
+        self._gfx = GFX(RESOLUTION[0][0], RESOLUTION[0][1], self._epd.set_pixel, self._epd.hline, self._epd.vline,
+                        self._epd.fill_rect, self._epd.fill, self._epd.points, self._epd.hspans, self._epd.vspans,
+                        self._epd.blit, self._epd.rect)
+        self._font = Font(RESOLUTION[0][0], RESOLUTION[0][1], self._epd.set_pixel, self._epd.points, self._epd.blit,
+                          self._epd.fill_rect)
+        self._layout = TextBox(self._font)
+        self._assets = Assets()
+        self._compositor = Compositor(self._epd)
+        self._status = None
 
         self._event_queue = []
         self._app = None
@@ -132,6 +143,71 @@ class FCB:
         """
         return self._font
 
+    @property
+    def layout(self):
+        """
+        An instance of the :class:`TextBox class <fcb._layout.TextBox>` for drawing wrapped paragraphs of text with\
+        :attr:`font`
+        """
+        return self._layout
+
+    @property
+    def assets(self):
+        """
+        An instance of the :class:`Assets class <fcb._assets.Assets>` for loading sprites from the ``/assets``\
+        directory
+        """
+        return self._assets
+
+    @property
+    def cache_stats(self):
+        """
+        The counters of the badge's caches, for sizing their budgets: ``assets`` has the\
+        :attr:`asset cache stats <fcb._assets.Assets.stats>` and ``text`` the\
+        :attr:`rendered string cache stats <fcb._font.Font.cache_stats>` of :attr:`font` and ``layout`` the\
+        :attr:`line break cache stats <fcb._layout.TextBox.cache_stats>` of :attr:`layout`.
+        """
+        return {'assets': self._assets.stats, 'text': self._font.cache_stats, 'layout': self._layout.cache_stats}
+
+    @property
+    def compositor(self):
+        """
+        An instance of the :class:`Compositor class <fcb._canvas.Compositor>` that draws layers onto the display.\
+        Changed layers are composited automatically before each display refresh.
+        """
+        return self._compositor
+
+    @property
+    def status(self):
+        """
+        A :class:`Canvas <fcb._canvas.Canvas>` along the top of the display for a status bar, created the first time\
+        it's used. It stays on top of the app's layers and of anything drawn straight onto the display, and is kept\
+        when switching apps.
+        """
+        if self._status is None:
+            self._status = Canvas(RESOLUTION[0][0], _STATUS_HEIGHT)
+            self._compositor.add(self._status)
+        return self._status
+
+    def add_layer(self, canvas):
+        """
+        Adds a layer for the current app to the display, on top of its other layers but below the status bar. The\
+        app's layers are removed when it exits.
+
+        :param canvas: The :class:`Canvas <fcb._canvas.Canvas>` to add
+        """
+        index = None
+        if self._status is not None:
+            index = self._compositor.layers.index(self._status)
+        self._compositor.add(canvas, index)
+
+    @property
+    def display_busy(self):
+        """
+        ``True`` while the display is updating. Drawing is still allowed, it will be shown once the update finishes.
+        """
+        return self._epd.busy
+
     def get_input(self, prompt=None):
         """
         Prompts for input on the serial port, returning when ``\\r`` or ``\\n`` is received
@@ -196,6 +272,9 @@ class FCB:
         :param name: The import name of the module of new app to load
         """
         self.debug_print("App loading: %s" % name)
+        for layer in self._compositor.layers:
+            if layer is not self._status:
+                self._compositor.remove(layer)
         app_mod = __import__(name, [], [], ["App"])
         self._app = app_mod.App(self)
 
@@ -223,15 +302,25 @@ class FCB:
         if self._app is None:
             self.load_app(_HOME_APP)
 
+        refreshing = False
         while True:
             if self._uart.any() != 0:
                 self._handle_uart()
             while self._event_waiting():
-                self._app.handle_event(self._event_queue.popleft())
+                self._app.handle_event(self._event_queue.pop(0))
             self._app.redraw()
-            if self._epd.dirty:
+            self._compositor.compose()
+            self._adt.poll()
+            # The panel takes seconds to update. Events keep being handled and apps keep drawing into the back buffer
+            # while it does, and only the latest frame is sent once it's idle again.
+            busy = self._epd.poll()
+            if refreshing and not busy:
+                refreshing = False
+                self.debug_print("Display refreshed in %dms" % self._epd.stats['refresh_ms'])
+            if self._epd.dirty and not busy:
                 self.debug_print("Display buffer dirty, redrawing")
-                self._epd.show()
+                self._epd.show(block=False)
+                refreshing = self._epd.busy
 
     def clear_disp(self):
         """
@@ -0,0 +1,16 @@
+import os
+import sys
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+# MicroPython's builtin modules are replaced by the stand-ins in fakes/, and the badge library is imported from the
+# firmware's frozen modules directory
+sys.path.insert(0, os.path.join(_HERE, 'fakes'))
+sys.path.insert(0, os.path.join(_HERE, '..', 'firmware', 'modules'))
+
+# MicroPython's additions to the time module
+if not hasattr(time, 'ticks_ms'):
+    time.ticks_ms = lambda: int(time.monotonic() * 1000)
+    time.ticks_diff = lambda a, b: a - b
+    time.sleep_ms = lambda ms: time.sleep(ms / 1000)
@@ -0,0 +1,75 @@
+"""
+Host stand-in for MicroPython's framebuf module, covering the GS2_HMSB and MONO_HLSB formats the badge uses.
+
+Pixels are stored exactly as MicroPython stores them, rows padded to whole bytes, so code that reads or writes the
+underlying buffer directly sees the same layout as on the badge.
+"""
+
+MONO_HLSB = 3
+GS2_HMSB = 5
+
+
+class FrameBuffer:
+    def __init__(self, buf, width, height, format, stride=None):
+        self.buf = buf
+        self.width = width
+        self.height = height
+        self.format = format
+        stride = width if stride is None else stride
+        if format == GS2_HMSB:
+            self.stride = (stride + 3) & ~3
+        elif format == MONO_HLSB:
+            self.stride = (stride + 7) & ~7
+        else:
+            raise ValueError("invalid format")
+
+    def _get(self, x, y):
+        if self.format == GS2_HMSB:
+            i = (x + y * self.stride) >> 2
+            return (self.buf[i] >> ((x & 3) << 1)) & 3
+        i = (x + y * self.stride) >> 3
+        return (self.buf[i] >> (7 - (x & 7))) & 1
+
+    def _set(self, x, y, c):
+        if self.format == GS2_HMSB:
+            i = (x + y * self.stride) >> 2
+            shift = (x & 3) << 1
+            self.buf[i] = (self.buf[i] & ~(3 << shift)) | ((c & 3) << shift)
+        else:
+            i = (x + y * self.stride) >> 3
+            shift = 7 - (x & 7)
+            self.buf[i] = (self.buf[i] & ~(1 << shift)) | ((c & 1) << shift)
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        for yy in range(max(y, 0), min(y + h, self.height)):
+            for xx in range(max(x, 0), min(x + w, self.width)):
+                self._set(xx, yy, c)
+
+    def fill(self, c):
+        self.fill_rect(0, 0, self.width, self.height, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c):
+        self.hline(x, y, w, c)
+        self.hline(x, y + h - 1, w, c)
+        self.vline(x, y, h, c)
+        self.vline(x + w - 1, y, h, c)
+
+    def blit(self, fb, x, y, key=-1):
+        for j in range(max(0, -y), min(fb.height, self.height - y)):
+            for i in range(max(0, -x), min(fb.width, self.width - x)):
+                c = fb._get(i, j)
+                if c != key:
+                    self._set(x + i, y + j, c)
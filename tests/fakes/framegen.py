@@ -0,0 +1,86 @@
+"""
+Host stand-in for the native framegen module in firmware/modframegen.c.
+
+pack_planes here is the reference the native packer is tested against, so it is written for clarity rather than
+speed: every output bit is looked up on its own.
+"""
+
+
+def pack_planes(src, width, height, black, red, window=None):
+    row_bytes = height // 8
+    if window is None:
+        row0, row1, col0, col1 = 0, width - 1, 0, row_bytes - 1
+    else:
+        row0, row1 = max(window[0], 0), min(window[1], width - 1)
+        col0, col1 = max(window[2], 0), min(window[3], row_bytes - 1)
+    changed = None
+    for x in range(row0, row1 + 1):
+        for col in range(col0, col1 + 1):
+            out_b = out_r = 0
+            for i in range(8):
+                y = col * 8 + i
+                v = (src[(x + y * width) >> 2] >> ((x & 3) << 1)) & 3
+                # The smallest y goes in the most significant bit
+                if v == 1:
+                    out_b |= 0x80 >> i
+                elif v == 2:
+                    out_r |= 0x80 >> i
+            idx = x * row_bytes + col
+            if black[idx] != out_b or red[idx] != out_r:
+                black[idx] = out_b
+                red[idx] = out_r
+                if changed is None:
+                    changed = [x, x, col, col]
+                changed[1] = x
+                changed[2] = min(changed[2], col)
+                changed[3] = max(changed[3], col)
+    return None if changed is None else tuple(changed)
+
+
+def blank(buf):
+    return not any(buf)
+
+
+def _span(buf, width, height, x, y, length, vertical, colour, box):
+    if vertical:
+        if length <= 0 or not 0 <= x < width or y + length <= 0 or y >= height:
+            return
+        start, end = max(y, 0), min(y + length, height) - 1
+        pixels = [(x, i) for i in range(start, end + 1)]
+        area = (x, start, x, end)
+    else:
+        if length <= 0 or not 0 <= y < height or x + length <= 0 or x >= width:
+            return
+        start, end = max(x, 0), min(x + length, width) - 1
+        pixels = [(i, y) for i in range(start, end + 1)]
+        area = (start, y, end, y)
+    for px, py in pixels:
+        i = (px + py * width) >> 2
+        shift = (px & 3) << 1
+        buf[i] = (buf[i] & ~(3 << shift)) | ((colour & 3) << shift)
+    box[0] = min(box[0], area[0])
+    box[1] = min(box[1], area[1])
+    box[2] = max(box[2], area[2])
+    box[3] = max(box[3], area[3])
+
+
+def _draw(buf, width, height, coords, colour, stride, vertical):
+    if coords.typecode != 'h':
+        raise TypeError("coordinates must be array('h')")
+    box = [width, height, -1, -1]
+    for i in range(0, len(coords) - stride + 1, stride):
+        length = 1 if stride == 2 else coords[i + 2]
+        _span(buf, width, height, coords[i], coords[i + 1], length, vertical, colour, box)
+    return None if box[2] < 0 else tuple(box)
+
+
+def draw_points(buf, width, height, coords, colour):
+    return _draw(buf, width, height, coords, colour, 2, False)
+
+
+def draw_hspans(buf, width, height, spans, colour):
+    return _draw(buf, width, height, spans, colour, 3, False)
+
+
+def draw_vspans(buf, width, height, spans, colour):
+    return _draw(buf, width, height, spans, colour, 3, True)
@@ -0,0 +1,35 @@
+"""Host stand-in for MicroPython's machine module, just enough for the fcb package to import."""
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+
+    def __init__(self, id, mode=-1, value=None):
+        self._value = value or 0
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        self._value = value
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+
+class I2C:
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class UART:
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class EPSPI:
+    def __init__(self, *args, **kwargs):
+        pass
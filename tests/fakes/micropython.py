@@ -0,0 +1,5 @@
+"""Host stand-in for the MicroPython builtin module."""
+
+
+def const(value):
+    return value
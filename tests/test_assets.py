@@ -0,0 +1,39 @@
+import pytest
+
+from fcb._assets import Assets
+
+
+class _Asset:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = f.read()
+
+
+@pytest.fixture
+def assets(tmp_path):
+    for name, size in (('a', 100), ('b', 100), ('c', 100), ('huge', 1000)):
+        (tmp_path / name).write_bytes(bytes(size))
+    return Assets(str(tmp_path), budget=250)
+
+
+def test_least_recently_used_is_evicted(assets):
+    assets.get('a', _Asset)
+    assets.get('b', _Asset)
+    assets.get('a', _Asset)
+    assets.get('c', _Asset)
+    assert assets.stats == {'hits': 1, 'misses': 3, 'evictions': 1}
+    assets.get('a', _Asset)
+    assert assets.stats['hits'] == 2
+    assert assets.used == 200
+
+
+def test_oversized_asset_leaves_cache_alone(assets):
+    assets.get('a', _Asset)
+    assets.get('b', _Asset)
+    huge = assets.get('huge', _Asset)
+    assert len(huge.data) == 1000
+    assert assets.stats['evictions'] == 0
+    assert assets.used == 200
+    assets.get('a', _Asset)
+    assets.get('b', _Asset)
+    assert assets.stats['hits'] == 2
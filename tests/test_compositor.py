@@ -0,0 +1,116 @@
+from fcb._epd import EPD, WHITE, BLACK, RED
+from fcb._gfx import GFX
+from fcb._sprite import TRANSPARENT
+from fcb._canvas import Canvas, Compositor
+
+
+def _display():
+    epd = EPD(spi=None, cs_pin=None, reset_pin=None, busy_pin=None, adt=None)
+    gfx = GFX(epd.width, epd.height, epd.set_pixel, epd.hline, epd.vline, epd.fill_rect, epd.fill, epd.points,
+              epd.hspans, epd.vspans, epd.blit, epd.rect)
+    return epd, gfx, Compositor(epd)
+
+
+def test_layer_survives_clearing_the_display():
+    epd, gfx, compositor = _display()
+    status = Canvas(epd.width, 10)
+    compositor.add(status)
+    status.fill(BLACK)
+    compositor.compose()
+    assert epd.buf.pixel(5, 5) == BLACK
+    # What circle_test does on every redraw
+    gfx.fill_rect(0, 0, epd.width, epd.height, WHITE)
+    assert epd.buf.pixel(5, 5) == WHITE
+    compositor.compose()
+    assert epd.buf.pixel(5, 5) == BLACK
+    assert epd.buf.pixel(5, 10) == WHITE
+
+
+def test_drawing_shows_through_transparent_pixels_only():
+    epd, gfx, compositor = _display()
+    overlay = Canvas(20, 20, 40, 40, transparent=True)
+    compositor.add(overlay)
+    overlay.fill_rect(0, 0, 10, 20, RED)
+    compositor.compose()
+    gfx.fill_rect(30, 30, 40, 40, BLACK)
+    compositor.compose()
+    assert epd.buf.pixel(45, 45) == RED
+    assert epd.buf.pixel(55, 45) == BLACK
+    assert epd.buf.pixel(35, 35) == BLACK
+
+
+def test_drawing_away_from_layers_is_kept():
+    epd, gfx, compositor = _display()
+    status = Canvas(epd.width, 10)
+    compositor.add(status)
+    status.fill(BLACK)
+    compositor.compose()
+    epd._take_dirty()
+    gfx.fill_rect(100, 50, 20, 20, RED)
+    compositor.compose()
+    assert epd.buf.pixel(110, 60) == RED
+    assert epd.buf.pixel(5, 5) == BLACK
+    # Only the drawing itself is dirty, the layers weren't touched
+    assert epd._take_dirty() == [100, 50, 119, 69]
+
+
+def test_compose_without_changes_draws_nothing():
+    epd, gfx, compositor = _display()
+    compositor.add(Canvas(epd.width, 10))
+    compositor.compose()
+    epd._take_dirty()
+    gfx.fill_rect(0, 0, 8, 8, BLACK)
+    compositor.compose()
+    epd._take_dirty()
+    compositor.compose()
+    assert epd._take_dirty() is None
+
+
+def test_transparent_key_is_not_drawn():
+    epd, gfx, compositor = _display()
+    overlay = Canvas(8, 8, transparent=True)
+    compositor.add(overlay)
+    compositor.compose()
+    assert overlay.buf.pixel(0, 0) == TRANSPARENT
+    assert epd.buf.pixel(0, 0) == WHITE
+
+
+def test_drawing_beside_a_layer_is_kept():
+    epd, gfx, compositor = _display()
+    gfx.fill_rect(40, 40, 3, 10, BLACK)
+    compositor.compose()
+    # Starts partway into a byte of the framebuffer
+    compositor.add(Canvas(8, 8, 43, 40))
+    compositor.compose()
+    assert [epd.buf.pixel(x, 42) for x in range(40, 44)] == [BLACK, BLACK, BLACK, WHITE]
+
+
+def test_removing_a_layer_shows_the_drawing_under_it():
+    epd, gfx, compositor = _display()
+    gfx.fill_rect(20, 20, 40, 20, BLACK)
+    compositor.compose()
+    toast = Canvas(20, 8, 30, 24)
+    toast.fill(RED)
+    compositor.add(toast)
+    compositor.compose()
+    assert epd.buf.pixel(35, 28) == RED
+    compositor.remove(toast)
+    compositor.compose()
+    assert all(epd.buf.pixel(x, y) == BLACK for x in range(20, 60) for y in range(20, 40))
+
+
+def test_moving_a_layer_shows_drawing_done_under_it():
+    epd, gfx, compositor = _display()
+    menu = Canvas(16, 16, 0, 0)
+    menu.fill(RED)
+    compositor.add(menu)
+    compositor.compose()
+    # Drawn while the menu is covering it
+    gfx.fill_rect(0, 0, 8, 8, BLACK)
+    compositor.compose()
+    assert epd.buf.pixel(4, 4) == RED
+    menu.x = 100
+    compositor.compose()
+    assert epd.buf.pixel(4, 4) == BLACK
+    assert epd.buf.pixel(12, 12) == WHITE
+    assert epd.buf.pixel(104, 4) == RED
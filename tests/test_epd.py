@@ -0,0 +1,145 @@
+import time
+
+from machine import Pin
+
+from fcb._epd import EPD, WHITE, BLACK, RED
+
+
+class _SPI:
+    def __init__(self):
+        # (is data, bytes) for every write
+        self.writes = []
+
+    def write(self, data, dc):
+        self.writes.append((dc, bytes(data)))
+
+    def write_script(self, script):
+        pass
+
+    def data_after(self, command):
+        # The data writes that followed the last time the command was sent
+        for i in range(len(self.writes) - 1, -1, -1):
+            if self.writes[i] == (False, bytes((command,))):
+                data = []
+                for dc, payload in self.writes[i + 1:]:
+                    if not dc:
+                        break
+                    data.append(payload)
+                return data
+        return None
+
+
+class _ADT:
+    def temperature(self):
+        return 20
+
+    def epd_temp(self):
+        return 20
+
+
+def _epd():
+    spi = _SPI()
+    epd = EPD(spi=spi, cs_pin=Pin(15), reset_pin=Pin(0), busy_pin=Pin(16), adt=_ADT())
+    return epd, spi
+
+
+def test_first_show_uploads_whole_planes():
+    epd, spi = _epd()
+    epd.hline(0, 0, 10, RED)
+    epd.show()
+    assert spi.data_after(0x24) == [bytes(len(epd._planes[0]))]
+    red = spi.data_after(0x26)
+    assert len(red) == 1 and len(red[0]) == len(epd._planes[1])
+
+
+def test_narrow_window_is_one_write_per_plane():
+    epd, spi = _epd()
+    epd.show()
+    spi.writes = []
+    epd.hline(10, 20, 5, BLACK)
+    epd.show()
+    # Gate rows 10 to 14, column byte 2 only, with y = 20 in bit 4 counting from the MSB
+    assert spi.data_after(0x44) == [bytes((2, 2))]
+    assert spi.data_after(0x24) == [b'\x08' * 5]
+    assert spi.data_after(0x26) is None
+
+
+def test_window_rows_keep_their_order():
+    epd, spi = _epd()
+    epd.show()
+    spi.writes = []
+    epd.set_pixel(40, 30, BLACK)
+    epd.set_pixel(42, 45, BLACK)
+    epd.show()
+    # Rows 40 to 42, column bytes 3 to 5, row after row
+    assert spi.data_after(0x24) == [bytes((0x02, 0, 0, 0, 0, 0, 0, 0, 0x04))]
+
+
+def test_busy_is_a_pure_check():
+    epd, spi = _epd()
+    epd.show(block=False)
+    assert epd.busy
+    time.sleep(0.06)
+    writes = len(spi.writes)
+    # Reading busy never finishes the update or talks to the panel
+    assert epd.busy
+    assert len(spi.writes) == writes
+    # poll() notices the panel is done and puts the controller to sleep
+    assert not epd.poll()
+    assert not epd.busy
+    assert spi.data_after(0x10) == [b'\x01']
+
+
+def _fast_partial_epd():
+    epd, spi = _epd()
+    epd.fast_partial = True
+    # Keeps the waveform that was used loaded
+    epd.warm = True
+    epd.show()
+    return epd, spi
+
+
+def test_fast_partial_window_without_red():
+    epd, spi = _fast_partial_epd()
+    epd.hline(10, 20, 5, BLACK)
+    epd.show()
+    assert epd._awake_lut is epd._select_lut('partial')
+
+
+def test_fast_partial_falls_back_for_red_in_the_window():
+    epd, spi = _fast_partial_epd()
+    epd.hline(10, 20, 5, RED)
+    epd.show()
+    assert epd._awake_lut is epd._select_lut('full')
+    assert spi.data_after(0x26) is not None
+
+
+def test_fast_partial_falls_back_for_red_leaving_the_window():
+    epd, spi = _fast_partial_epd()
+    epd.hline(10, 20, 5, RED)
+    epd.hline(200, 100, 5, RED)
+    epd.show()
+    epd.hline(10, 20, 5, WHITE)
+    epd.show()
+    assert epd._awake_lut is epd._select_lut('full')
+    # Red elsewhere on the screen doesn't stop the quick waveform being used
+    epd.hline(50, 60, 5, BLACK)
+    epd.show()
+    assert epd._awake_lut is epd._select_lut('partial')
+
+
+def test_tall_narrow_window_is_sent_in_chunks():
+    epd, spi = _epd()
+    epd.show()
+    spi.writes = []
+    epd.vline(0, 0, 1, BLACK)
+    epd.vline(epd.width - 1, 9, 1, BLACK)
+    epd.show()
+    # All 296 gate rows, column bytes 0 and 1
+    data = spi.data_after(0x24)
+    assert len(data) > 1
+    assert all(len(chunk) <= len(epd._chunk) and len(chunk) % 2 == 0 for chunk in data)
+    data = b''.join(data)
+    assert len(data) == 296 * 2
+    assert data[:2] == b'\x80\x00' and data[-2:] == b'\x00\x40'
+    assert not any(data[2:-2])
@@ -0,0 +1,48 @@
+import random
+
+from fcb._gfx import GFX
+
+
+class _Spans:
+    # Records the spans fill_triangle hands on, and the pixels they cover
+    def __init__(self):
+        self.rows = []
+        self.pixels = set()
+
+    def __call__(self, spans, colour):
+        for i in range(0, len(spans), 3):
+            x, y, width = spans[i:i + 3]
+            self.rows.append(y)
+            self.pixels.update((x + j, y) for j in range(width))
+
+
+def _fill(*corners):
+    spans = _Spans()
+    gfx = GFX(296, 128, None, hspans=spans)
+    gfx.fill_triangle(*corners, 1)
+    return spans
+
+
+def test_flat_top_starts_at_its_top_row():
+    spans = _fill(0, 10, 20, 10, 10, 20)
+    assert min(spans.rows) == 10
+    assert max(spans.rows) == 20
+
+
+def test_each_row_is_drawn_once():
+    rng = random.Random(2)
+    for _ in range(500):
+        corners = [rng.randrange(-20, 316) if i % 2 == 0 else rng.randrange(-20, 148) for i in range(6)]
+        spans = _fill(*corners)
+        assert len(spans.rows) == len(set(spans.rows)), corners
+
+
+def test_stays_within_bounding_box():
+    rng = random.Random(3)
+    for _ in range(500):
+        corners = [rng.randrange(0, 296) if i % 2 == 0 else rng.randrange(0, 128) for i in range(6)]
+        xs, ys = corners[0::2], corners[1::2]
+        spans = _fill(*corners)
+        assert spans.rows, corners
+        assert min(spans.rows) == min(ys) and max(spans.rows) == max(ys), corners
+        assert all(min(xs) <= x <= max(xs) for x, _ in spans.pixels), corners
@@ -0,0 +1,102 @@
+import pytest
+
+from fcb._canvas import Canvas
+from fcb._font import Font, FontFile, _FONT
+from fcb._surface import BLACK, RED
+
+_TEXT = 'Hello, badge! 0123 {~}'
+
+
+def _canvas(**kwargs):
+    canvas = Canvas(296, 32)
+    canvas.font = Font(canvas.width, canvas.height, canvas.set_pixel, canvas.points, canvas.blit, canvas.fill_rect,
+                       **kwargs)
+    return canvas
+
+
+@pytest.fixture
+def big_face(tmp_path):
+    # A 16x19 fixed width font file, each glyph the built in one stretched out
+    path = tmp_path / 'big.bin'
+    data = bytearray((16, 19))
+    for code in range(256):
+        for x in range(16):
+            column = _FONT[code * 5 + x // 4]
+            data.extend((column | (column << 11)).to_bytes(3, 'little'))
+    path.write_bytes(bytes(data))
+    face = FontFile(str(path))
+    yield face
+    face.close()
+
+
+@pytest.mark.parametrize('budget', [0, 40, 2048])
+@pytest.mark.parametrize('cache', [False, True])
+def test_blitting_matches_pixel_drawing(budget, cache):
+    canvas = _canvas(cache_budget=budget)
+    for _ in range(2):
+        canvas.font.text(_TEXT, -3, 2, BLACK, cache=cache)
+    canvas.font.draw_char('R', 100, 20, RED)
+    expected = Canvas(296, 32)
+    font = Font(expected.width, expected.height, expected.set_pixel)
+    font.text(_TEXT, -3, 2, BLACK)
+    font.draw_char('R', 100, 20, RED)
+    assert canvas._buf_data == expected._buf_data
+    assert canvas.font.cache_stats['bytes'] <= budget
+
+
+def test_glyphs_are_charged_to_budget(big_face):
+    canvas = _canvas()
+    canvas.font.face = big_face
+    canvas.font.draw_char('A', 0, 0, BLACK)
+    # 16 pixels of 2 bits make 4 bytes a row
+    assert canvas.font.cache_stats['bytes'] == 4 * 19
+
+
+def test_glyphs_stay_within_budget(big_face):
+    canvas = _canvas(cache_budget=2048)
+    canvas.font.face = big_face
+    text = ''.join(chr(c) for c in range(32, 127))
+    for colour in (0, 1, 2):
+        for i in range(0, len(text), 10):
+            canvas.font.draw_char(text[i], 0, 0, colour)
+            canvas.font.text(text[i:i + 10], 0, 8, colour)
+    stats = canvas.font.cache_stats
+    assert stats['bytes'] <= 2048
+    assert stats['evictions'] > 0
+
+
+def test_changing_face_empties_cache(big_face):
+    canvas = _canvas()
+    canvas.font.text(_TEXT, 0, 0, BLACK)
+    assert canvas.font.cache_stats['bytes']
+    canvas.font.face = big_face
+    assert canvas.font.cache_stats['bytes'] == 0
+
+
+def test_strings_are_only_cached_when_asked():
+    canvas = _canvas()
+    font = canvas.font
+    for i in range(20):
+        font.text('%d' % i, 0, 0, BLACK)
+    # Only the glyphs of the ten digits are cached
+    assert font.cache_stats['bytes'] == 10 * 16
+    font.text('Label', 0, 10, BLACK, cache=True)
+    hits = font.cache_stats['hits']
+    font.text('Label', 0, 10, BLACK, cache=True)
+    assert font.cache_stats['hits'] == hits + 1
+
+
+def test_blit_covers_just_the_glyph(tmp_path):
+    # An 'i' two pixels wide and a 'W' eight wide, ten pixels high
+    path = tmp_path / 'narrow.fnt'
+    data = bytearray(b'FF' + bytes((8, 10, ord('W'))) + (ord('i') - ord('W') + 1).to_bytes(2, 'little'))
+    data.extend(bytes((2 if code == ord('i') else 8) for code in range(ord('W'), ord('i') + 1)))
+    for code in range(ord('W'), ord('i') + 1):
+        data.extend(b'\xff\x03' * 8)
+    path.write_bytes(bytes(data))
+    face = FontFile(str(path))
+    canvas = _canvas(face=face)
+    canvas.font.draw_char('i', 10, 4, BLACK)
+    assert canvas._take_dirty() == [10, 4, 11, 13]
+    assert canvas.buf.pixel(11, 13) == BLACK and canvas.buf.pixel(12, 4) == 0
+    face.close()
@@ -0,0 +1,112 @@
+"""
+Golden images of the basic drawing primitives, drawn through GFX onto the real EPD backend the same way FCB wires them
+up. Every scene is drawn into the top left corner, partly off screen to cover clipping, and compared with the image in
+golden/. Everything outside the compared area has to stay white.
+
+Run with FCB_UPDATE_GOLDEN=1 to rewrite the images after an intended change, and check the diff.
+"""
+import os
+
+import pytest
+
+from fcb._epd import EPD, WHITE, BLACK, RED
+from fcb._gfx import GFX
+
+_GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+_CROP_WIDTH = 64
+_CROP_HEIGHT = 32
+_CHARS = '.#r?'
+
+
+def _vline(gfx):
+    gfx.vline(0, 0, 10, BLACK)
+    gfx.vline(3, -4, 10, RED)
+    gfx.vline(6, 5, 1, BLACK)
+    gfx.vline(9, 2, 0, BLACK)
+    gfx.vline(12, 28, 4, BLACK)
+    gfx.vline(-1, 0, 10, BLACK)
+
+
+def _hline(gfx):
+    gfx.hline(0, 0, 10, BLACK)
+    gfx.hline(-4, 3, 10, RED)
+    gfx.hline(5, 6, 1, BLACK)
+    gfx.hline(2, 9, 0, BLACK)
+    gfx.hline(58, 12, 6, BLACK)
+    gfx.hline(0, -1, 10, BLACK)
+
+
+def _fill_rect(gfx):
+    gfx.fill_rect(1, 1, 8, 5, BLACK)
+    gfx.fill_rect(-3, 10, 7, 4, RED)
+    gfx.fill_rect(12, -2, 5, 5, BLACK)
+    gfx.fill_rect(20, 20, 1, 1, RED)
+    gfx.fill_rect(30, 4, 0, 5, BLACK)
+    gfx.fill_rect(4, 3, 3, 1, WHITE)
+
+
+def _rect(gfx):
+    gfx.rect(1, 1, 8, 5, BLACK)
+    gfx.rect(-3, 10, 7, 4, RED)
+    gfx.rect(12, -2, 5, 5, BLACK)
+    gfx.rect(20, 20, 1, 1, RED)
+    gfx.rect(24, 20, 1, 6, BLACK)
+    gfx.rect(28, 20, 6, 1, BLACK)
+
+
+def _fill_circle(gfx):
+    gfx.fill_circle(10, 10, 8, BLACK)
+    gfx.fill_circle(30, 10, 0, RED)
+    gfx.fill_circle(30, 20, 1, RED)
+    gfx.fill_circle(40, 15, 4, RED)
+    gfx.fill_circle(2, 25, 6, BLACK)
+    gfx.fill_circle(55, -2, 5, BLACK)
+
+
+_SCENES = {
+    'vline': _vline,
+    'hline': _hline,
+    'fill_rect': _fill_rect,
+    'rect': _rect,
+    'fill_circle': _fill_circle,
+}
+
+
+@pytest.fixture
+def epd():
+    return EPD(spi=None, cs_pin=None, reset_pin=None, busy_pin=None, adt=None)
+
+
+@pytest.fixture
+def gfx(epd):
+    return GFX(epd.width, epd.height, epd.set_pixel, epd.hline, epd.vline, epd.fill_rect, epd.fill, epd.points,
+               epd.hspans, epd.vspans, epd.blit, epd.rect)
+
+
+def _crop(epd):
+    return '\n'.join(''.join(_CHARS[epd.buf.pixel(x, y)] for x in range(_CROP_WIDTH))
+                     for y in range(_CROP_HEIGHT)) + '\n'
+
+
+@pytest.mark.parametrize('name', sorted(_SCENES))
+def test_golden(name, epd, gfx):
+    _SCENES[name](gfx)
+    image = _crop(epd)
+    path = os.path.join(_GOLDEN, name + '.txt')
+    if os.environ.get('FCB_UPDATE_GOLDEN'):
+        with open(path, 'w') as f:
+            f.write(image)
+    with open(path) as f:
+        assert image == f.read()
+    outside = [(x, y) for y in range(epd.height) for x in range(epd.width)
+               if (x >= _CROP_WIDTH or y >= _CROP_HEIGHT) and epd.buf.pixel(x, y) != WHITE]
+    assert not outside
+
+
+@pytest.mark.parametrize('name', sorted(_SCENES))
+def test_matches_pixel_drawing(name, epd, gfx):
+    # The same scene drawn a pixel at a time, without any of the backend shortcuts
+    slow = EPD(spi=None, cs_pin=None, reset_pin=None, busy_pin=None, adt=None)
+    _SCENES[name](GFX(slow.width, slow.height, slow.set_pixel))
+    _SCENES[name](gfx)
+    assert epd._buf_data == slow._buf_data
@@ -0,0 +1,51 @@
+from fcb._canvas import Canvas
+from fcb._surface import BLACK
+
+_TEXT = 'The quick brown fox jumps over the lazy dog\nSupercalifragilistic word'
+
+
+def _recording_canvas():
+    canvas = Canvas(64, 40)
+    drawn = []
+    text = canvas.font.text
+
+    def record(line, *args, **kwargs):
+        drawn.append(line)
+        text(line, *args, **kwargs)
+
+    canvas.font.text = record
+    return canvas, drawn
+
+
+def test_wrap_fits_width():
+    canvas = Canvas(64, 40)
+    lines = canvas.layout.wrap(_TEXT, 60)
+    assert lines == ('The quick', 'brown fox', 'jumps over', 'the lazy', 'dog', 'Supercalif', 'ragilistic', 'word')
+    assert all(canvas.font.width(line) - 1 <= 60 for line in lines)
+
+
+def test_overflow_ends_with_ellipsis():
+    canvas, drawn = _recording_canvas()
+    assert canvas.layout.draw(_TEXT, 0, 0, 60, 37, BLACK) == 4
+    assert drawn == ['The quick', 'brown fox', 'jumps over', 'the laz...']
+
+
+def test_box_off_screen_still_counts_its_lines():
+    canvas, drawn = _recording_canvas()
+    assert canvas.layout.draw(_TEXT, 100, 0, 60, 37, BLACK) == 4
+    assert canvas.layout.draw(_TEXT, -60, 0, 60, 37, BLACK) == 4
+    assert drawn == []
+
+
+def test_lines_off_screen_are_skipped():
+    canvas, drawn = _recording_canvas()
+    canvas.layout.draw(_TEXT * 3, 0, -50, 60, 200, BLACK)
+    # Lines 9 pixels apart, only those overlapping the 40 pixel high canvas are drawn
+    assert drawn == list(canvas.layout.wrap(_TEXT * 3, 60)[5:10])
+
+
+def test_line_breaks_are_cached():
+    canvas = Canvas(64, 40)
+    for _ in range(3):
+        canvas.layout.draw(_TEXT, 0, 0, 60, 40, BLACK)
+    assert canvas.layout.cache_stats == {'hits': 2, 'misses': 1, 'evictions': 0}
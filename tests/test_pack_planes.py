@@ -0,0 +1,144 @@
+"""
+framegen.pack_planes converts the landscape GS2 framebuffer into the panel's portrait B/W and red planes.
+
+Framebuffer column x becomes gate row x of the panel, 16 bytes long, with y running across the row and the smallest y
+in the most significant bit. That is the transpose of what the old FrameGen iterator produced: it walked
+pixel(col, row) with col running along a gate row, so it read the 296x128 buffer as if it were 128x296 and every gate
+row past 127 came out blank. The bit meanings are unchanged, a set bit is black in the B/W plane and red in the red
+plane.
+
+The native packer in firmware/framegen_pack.h is built with the host compiler and checked against the reference in
+fakes/framegen.py.
+"""
+import ctypes
+import os
+import random
+import shutil
+import subprocess
+
+import pytest
+
+import framegen
+
+WIDTH = 296
+HEIGHT = 128
+ROW_BYTES = HEIGHT // 8
+PLANE = WIDTH * ROW_BYTES
+
+_FIRMWARE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'firmware')
+_SHIM = """
+#include "framegen_pack.h"
+
+bool pack(const uint8_t *src, int width, int row_bytes, uint8_t *black, uint8_t *red,
+        int row0, int row1, int col0, int col1, int *changed) {
+    return framegen_pack(src, width, row_bytes, black, red, row0, row1, col0, col1, changed);
+}
+"""
+
+
+@pytest.fixture(scope='module')
+def native(tmp_path_factory):
+    compiler = shutil.which('cc') or shutil.which('gcc')
+    if compiler is None:
+        pytest.skip("no C compiler")
+    tmp = tmp_path_factory.mktemp('framegen')
+    shim = tmp / 'shim.c'
+    shim.write_text(_SHIM)
+    lib_path = tmp / 'framegen_pack.so'
+    subprocess.check_call([compiler, '-std=c99', '-O2', '-shared', '-fPIC', '-I', _FIRMWARE, '-o', str(lib_path),
+                           str(shim)])
+    lib = ctypes.CDLL(str(lib_path))
+    lib.pack.restype = ctypes.c_bool
+
+    def pack_planes(src, width, height, black, red, window=None):
+        # Mirrors the argument handling of the MicroPython binding in modframegen.c
+        row_bytes = height // 8
+        if window is None:
+            window = (0, width - 1, 0, row_bytes - 1)
+        row0, row1 = max(window[0], 0), min(window[1], width - 1)
+        col0, col1 = max(window[2], 0), min(window[3], row_bytes - 1)
+        c_src = (ctypes.c_uint8 * len(src)).from_buffer(src)
+        c_black = (ctypes.c_uint8 * len(black)).from_buffer(black)
+        c_red = (ctypes.c_uint8 * len(red)).from_buffer(red)
+        changed = (ctypes.c_int * 4)()
+        if not lib.pack(c_src, width, row_bytes, c_black, c_red, row0, row1, col0, col1, changed):
+            return None
+        return tuple(changed)
+
+    return pack_planes
+
+
+@pytest.fixture(params=['reference', 'native'])
+def pack_planes(request):
+    if request.param == 'reference':
+        return framegen.pack_planes
+    return request.getfixturevalue('native')
+
+
+def _frame(pixels=()):
+    src = bytearray(WIDTH * HEIGHT // 4)
+    for x, y, v in pixels:
+        i = (x + y * WIDTH) >> 2
+        src[i] |= v << ((x & 3) << 1)
+    return src
+
+
+def _planes():
+    return bytearray(PLANE), bytearray(PLANE)
+
+
+def test_msb_first(pack_planes):
+    black, red = _planes()
+    src = _frame([(5, 0, 1), (5, 7, 2), (5, 8, 1), (200, 127, 1)])
+    pack_planes(src, WIDTH, HEIGHT, black, red)
+    row = 5 * ROW_BYTES
+    assert black[row] == 0x80
+    assert red[row] == 0x01
+    assert black[row + 1] == 0x80
+    # Past gate row 127, which the old FrameGen output always left blank
+    assert black[200 * ROW_BYTES + ROW_BYTES - 1] == 0x01
+    assert sum(bin(b).count('1') for b in black) == 3
+    assert sum(bin(b).count('1') for b in red) == 1
+
+
+def test_white_and_transparent_values_clear(pack_planes):
+    black, red = bytearray(b'\xff' * PLANE), bytearray(b'\xff' * PLANE)
+    src = _frame([(x, 0, 3) for x in range(WIDTH)])
+    pack_planes(src, WIDTH, HEIGHT, black, red)
+    assert not any(black) and not any(red)
+
+
+def test_changed_box(pack_planes):
+    black, red = _planes()
+    src = _frame()
+    assert pack_planes(src, WIDTH, HEIGHT, black, red) is None
+    src = _frame([(10, 20, 1), (30, 100, 2)])
+    assert pack_planes(src, WIDTH, HEIGHT, black, red) == (10, 30, 20 // 8, 100 // 8)
+    assert pack_planes(src, WIDTH, HEIGHT, black, red) is None
+
+
+def test_window_limits_packing(pack_planes):
+    black, red = _planes()
+    src = _frame([(10, 20, 1), (50, 60, 1)])
+    assert pack_planes(src, WIDTH, HEIGHT, black, red, (0, 20, 0, 15)) == (10, 10, 2, 2)
+    assert black[50 * ROW_BYTES + 60 // 8] == 0
+    # Out of range windows are clipped to the planes
+    assert pack_planes(src, WIDTH, HEIGHT, black, red, (-5, 1000, -1, 99)) == (50, 50, 7, 7)
+
+
+def test_native_matches_reference(native):
+    rng = random.Random(1)
+    for _ in range(20):
+        src = bytearray(rng.getrandbits(8) for _ in range(WIDTH * HEIGHT // 4))
+        planes = bytearray(rng.getrandbits(8) for _ in range(PLANE))
+        window = None
+        if rng.random() < 0.7:
+            row0 = rng.randrange(-3, WIDTH)
+            col0 = rng.randrange(-1, ROW_BYTES)
+            window = (row0, row0 + rng.randrange(WIDTH), col0, col0 + rng.randrange(ROW_BYTES))
+        ref_black, ref_red = bytearray(planes), bytearray(planes[::-1])
+        nat_black, nat_red = bytearray(planes), bytearray(planes[::-1])
+        assert native(src, WIDTH, HEIGHT, nat_black, nat_red, window) == \
+            framegen.pack_planes(src, WIDTH, HEIGHT, ref_black, ref_red, window)
+        assert nat_black == ref_black
+        assert nat_red == ref_red